@@ -21,7 +21,9 @@ except ImportError:
     HAS_WINSOUND = False
 
 from click_sequence import activate_window, perform_click_sequence
-from cube_logic import check_any_termination_satisfied, check_green_found, find_target_hits, SEARCH_REGION
+from cube_logic import check_green_found, compile_termination_groups, evaluate_plan, SEARCH_REGION
+from Utils.find_image import enable_profiling, format_profile, profiling_enabled
+from Utils.selectivity import HitRateTracker
 
 # 与 build_cube_execution.py 同级的 picture 目录，即项目下的 Cube/picture/
 _CUBE_DIR = Path(__file__).resolve().parent
@@ -122,6 +124,10 @@ def run_cube_loop(stop_event, status_callback, log_callback=None, equipment_type
         time.sleep(0.5)
         n = 0
         found_condition = False
+        # 终止条件组在循环前编译一次，每轮复用
+        plan = compile_termination_groups(termination_groups)
+        # 按本次会话的命中率先匹配少见的 key，未命中的轮次大多只需匹配少数模板
+        tracker = HitRateTracker()
         while not stop_event.is_set():
             n += 1
             if green_only:
@@ -145,7 +151,8 @@ def run_cube_loop(stop_event, status_callback, log_callback=None, equipment_type
                 log_callback(f"第{n}次，未设置终止条件，请在选择属性中添加")
                 time.sleep(1.0)
                 continue
-            satisfied_group = check_any_termination_satisfied(SEARCH_REGION, termination_groups, picture_dir)
+            # 一轮只截一次图，满足判定与命中日志共用同一张命中次数表
+            satisfied_group, hits, unchecked = evaluate_plan(SEARCH_REGION, plan, picture_dir, tracker=tracker)
             if satisfied_group is not None:
                 labels_str = " ".join(ATTR_LABELS.get(k, k) for k in satisfied_group)
                 log_callback(f"第{n}次，满足条件[{labels_str}]")
@@ -157,12 +164,13 @@ def run_cube_loop(stop_event, status_callback, log_callback=None, equipment_type
                 status_callback("已找到终止条件")
                 found_condition = True
                 break
-            hits = find_target_hits(SEARCH_REGION, termination_groups, picture_dir)
+            # 提前结束时没匹配的 key 单独列出，免得被误读为未命中
+            skipped = f"（未检测：{'、'.join(ATTR_LABELS.get(k, k) for k in unchecked)}）" if unchecked else ""
             if hits:
                 parts = [f"{cnt}个{ATTR_LABELS.get(key, key)}" for key, cnt in sorted(hits.items())]
-                log_callback(f"第{n}次，找到" + "，".join(parts))
+                log_callback(f"第{n}次，找到" + "，".join(parts) + skipped)
             else:
-                log_callback(f"第{n}次，未找到目标条件")
+                log_callback(f"第{n}次，未找到目标条件" + skipped)
             perform_click_sequence()
             if stop_event.is_set():
                 break
@@ -171,6 +179,8 @@ def run_cube_loop(stop_event, status_callback, log_callback=None, equipment_type
         log_callback(f"运行出错: {e}")
         status_callback(f"运行出错: {e}")
     else:
+        if tracker.rounds:
+            log_callback("找图统计：" + tracker.format_stats())
         if not found_condition:
             log_callback("已手动停止")
             status_callback("已手动停止")
@@ -499,6 +509,16 @@ class CubeApp:
     def _bind_keys(self):
         self.root.bind("<F11>", lambda e: self.start())
         self.root.bind("<F12>", lambda e: self.stop())
+        self.root.bind("<F10>", lambda e: self._dump_find_profile())
+
+    def _dump_find_profile(self):
+        """F10：首次按下开启找图耗时统计，之后每次把统计输出到日志。"""
+        if not profiling_enabled():
+            enable_profiling(True)
+            self._log_append("已开启找图统计，再按 F10 输出到日志")
+            return
+        for line in format_profile().splitlines():
+            self._log_append(line)
 
     def _register_global_hotkeys(self):
         if not HAS_KEYBOARD:
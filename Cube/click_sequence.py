@@ -2,14 +2,19 @@
 Cube 任务公用：执行点击序列（改为按空格键，不依赖坐标）、激活窗口（找 flag 并点击）。
 各任务脚本通过 from click_sequence import perform_click_sequence, activate_window 使用。
 """
+import sys
 import time
 from pathlib import Path
 
-import cv2
-import numpy as np
 import pyautogui
 import keyboard
 
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import get_image_center
+
 # 激活窗口用图
 FLAG_IMAGE = "picture/flag.png"
 MATCH_THRESHOLD = 0.99
@@ -22,22 +27,11 @@ def activate_window(base_dir, search_region, image_path=None):
     if not img_path.exists():
         print(f"警告: 激活窗口用图不存在 - {img_path}")
         return False
-    x1, y1, x2, y2 = search_region
-    left, top = x1, y1
-    width, height = x2 - x1, y2 - y1
     try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        template = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-        if template is None or template.shape[0] > height or template.shape[1] > width:
-            return False
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
-        if max_val < MATCH_THRESHOLD:
+        center = get_image_center(search_region, img_path, MATCH_THRESHOLD, roi=True)
+        if center is None:
             return False
-        click_x = left + max_loc[0] + template.shape[1] // 2
-        click_y = top + max_loc[1] + template.shape[0] // 2
+        click_x, click_y = center
         print(f"激活窗口: 找到 {image_path}，点击 ({click_x}, {click_y})")
         pyautogui.click(click_x, click_y)
         time.sleep(0.3)
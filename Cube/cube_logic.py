@@ -1,17 +1,16 @@
 """
 魔方主逻辑：在指定区域内按终止条件找图，多组之间为或逻辑。
-参考 int.py 的找图与过滤逻辑。
+找图统一委托 Utils.find_image；Cube 下各单属性脚本的预设与运行器见 presets.py。
 """
-import cv2
-import numpy as np
-import pyautogui
+import sys
 from pathlib import Path
 
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import Frame, find_all
+from Utils.selectivity import evaluate_groups
 
 # 查找范围 (x1, y1, x2, y2)，与 int.py 一致
 SEARCH_REGION = (0, 0, 1366, 768)
@@ -20,68 +19,16 @@ MATCH_THRESHOLD = 0.99
 MIN_MATCH_DISTANCE = 10
 
 
-def _load_template_gray(img_path):
-    """读取模板灰度图，返回 numpy 数组或 None。"""
-    path_str = str(Path(img_path).resolve())
-    template = cv2.imread(path_str, cv2.IMREAD_GRAYSCALE)
-    if template is not None:
-        return template
-    if HAS_PIL:
-        try:
-            pil_img = Image.open(path_str)
-            if pil_img.mode != "L":
-                pil_img = pil_img.convert("L")
-            return np.array(pil_img)
-        except Exception:
-            pass
-    return None
-
-
 def find_image_positions(region, image_path, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE):
     """
     在 region 内查找图片，返回所有不重叠的匹配位置（屏幕坐标）。
-    :param region: (x1, y1, x2, y2)
+    :param region: (x1, y1, x2, y2)，或已截好的 Frame
     :param image_path: 模板图片路径
     :param threshold: 匹配阈值
     :param min_distance: 最小匹配间距，小于此距离视为同一位置
     :return: [(x, y), ...]，按匹配分数从高到低保留
     """
-    path = Path(image_path)
-    if not path.exists():
-        return []
-    x1, y1, x2, y2 = region
-    left, top = x1, y1
-    width, height = x2 - x1, y2 - y1
-    try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        template = _load_template_gray(path)
-        if template is None or template.shape[0] > height or template.shape[1] > width:
-            return []
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        locations = np.where(result >= threshold)
-        matches = list(zip(*locations[::-1]))
-        if not matches:
-            return []
-        # 按分数从高到低排序，便于保留最优匹配
-        matches_with_score = [
-            (left + mx + template.shape[1] // 2, top + my + template.shape[0] // 2, float(result[my, mx]))
-            for mx, my in matches
-        ]
-        matches_with_score.sort(key=lambda t: -t[2])
-        filtered = []
-        for cx, cy, score in matches_with_score:
-            too_near = False
-            for (ex, ey) in filtered:
-                if np.sqrt((cx - ex) ** 2 + (cy - ey) ** 2) < min_distance:
-                    too_near = True
-                    break
-            if not too_near:
-                filtered.append((cx, cy))
-        return filtered
-    except Exception:
-        return []
+    return [m["center"] for m in find_all(region, image_path, threshold, min_distance)]
 
 
 def _group_required_counts(group):
@@ -94,52 +41,71 @@ def _group_required_counts(group):
     return required
 
 
-def _max_required_counts(groups):
-    """统计多组条件下每个 key 的最大需求次数（跳过 'any'）。"""
-    max_required = {}
-    for group in groups or []:
-        required = _group_required_counts(group)
-        for key, count in required.items():
-            prev = max_required.get(key, 0)
-            if count > prev:
-                max_required[key] = count
-    return max_required
+def _key_counter(frame, picture_dir, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE):
+    """返回 count(key) -> 在整块区域内不重叠的命中位置数（间距由 min_distance 控制）。"""
+    picture_dir = Path(picture_dir)
+
+    def count(key):
+        return len(find_all(frame, picture_dir / f"{key}.png", threshold, min_distance))
+
+    return count
 
 
-def find_target_hits(region, groups, picture_dir, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE):
+def count_key_hits(region, keys, picture_dir, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE):
     """
-    在 region 内统计“目标集”(groups 中出现过的 key)的命中次数。
-    为避免日志噪音，单个 key 的返回次数会被截断到该 key 在各组中的最大需求次数。
-    :return: dict[str, int]，仅包含命中次数 > 0 的 key
+    只截一次图，每个 key（picture_dir/{key}.png）只匹配一次，统计不重叠的命中次数。
+    :param region: (x1, y1, x2, y2)，或已截好的 Frame
+    :return: dict[str, int]，包含 keys 中的每个 key（未命中为 0）
     """
-    picture_dir = Path(picture_dir)
-    max_required = _max_required_counts(groups)
-    hits = {}
-    for key, cap in max_required.items():
-        img_path = picture_dir / f"{key}.png"
-        positions = find_image_positions(region, img_path, threshold, min_distance)
-        n = len(positions)
-        if n <= 0:
-            continue
-        hits[key] = n if n < cap else cap
-    return hits
+    frame = region if isinstance(region, Frame) else Frame.grab(region)
+    count = _key_counter(frame, picture_dir, threshold, min_distance)
+    return {key: count(key) for key in keys}
 
 
-def check_group_satisfied(region, group, picture_dir, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE):
+class TerminationPlan:
     """
-    检查某一组终止条件是否满足：在 region 内找到每组要求的次数（不同位置）。
-    例如 group=["str8","str8","str6"] 表示需要 str8 两处、str6 一处。
+    终止条件组编译后的判定计划，开始循环前编译一次，之后每轮复用。
+    terms: 每组转为 Utils.selectivity.evaluate_groups 的格式，如 ["str8","str8","str6"] -> [(("str8",), 2), (("str6",), 1)]；
+    keys: 去重后的 key（按首次出现的顺序）；
+    max_required: key -> 在各组中的最大需求次数，用于截断日志里的命中次数。
     """
-    required = _group_required_counts(group)
-    if not required:
-        return True
-    picture_dir = Path(picture_dir)
-    for key, count in required.items():
-        img_path = picture_dir / f"{key}.png"
-        positions = find_image_positions(region, img_path, threshold, min_distance)
-        if len(positions) < count:
-            return False
-    return True
+
+    def __init__(self, groups):
+        self.groups = [list(g) for g in groups or []]
+        required = [_group_required_counts(g) for g in self.groups]
+        self.terms = [[((key,), n) for key, n in req.items()] for req in required]
+        self.max_required = {}
+        for req in required:
+            for key, n in req.items():
+                self.max_required[key] = max(self.max_required.get(key, 0), n)
+        self.keys = tuple(self.max_required)
+
+    def __bool__(self):
+        return bool(self.groups)
+
+
+def compile_termination_groups(groups):
+    """把终止条件组（如 [["str8","str8","str6"], ...]）编译为 TerminationPlan。"""
+    return TerminationPlan(groups)
+
+
+def evaluate_plan(region, plan, picture_dir, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE, tracker=None):
+    """
+    按编译好的计划做一轮判定：只截一次图，由 Utils.selectivity.evaluate_groups 逐个匹配 key，
+    尽早放弃次数不够的组，剩余组都不需要的 key 不再匹配。
+    :param tracker: Utils.selectivity.HitRateTracker；给出时先匹配本次会话命中率最低的 key，并统计匹配 / 跳过数
+    :return: (第一个满足的 group 或 None, hits, unchecked)；hits 为已匹配且命中次数 > 0 的 key（截断到最大需求次数），
+             unchecked 为本轮提前结束而未匹配的 key
+    """
+    if not plan:
+        return None, {}, ()
+    frame = region if isinstance(region, Frame) else Frame.grab(region)
+    count = _key_counter(frame, picture_dir, threshold, min_distance)
+    idx, counts = evaluate_groups(plan.terms, count, tracker, plan.keys)
+    group = plan.groups[idx] if idx is not None else None
+    hits = {key: min(n, plan.max_required[key]) for key, n in counts.items() if n > 0}
+    unchecked = tuple(key for key in plan.keys if key not in counts)
+    return group, hits, unchecked
 
 
 def check_green_found(region, picture_dir, threshold=MATCH_THRESHOLD):
@@ -147,16 +113,3 @@ def check_green_found(region, picture_dir, threshold=MATCH_THRESHOLD):
     path = Path(picture_dir) / "green.png"
     positions = find_image_positions(region, path, threshold=threshold, min_distance=MIN_MATCH_DISTANCE)
     return len(positions) > 0
-
-
-def check_any_termination_satisfied(region, groups, picture_dir, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE):
-    """
-    多组终止条件为或逻辑：任一组满足即返回该组，否则返回 None。
-    :param groups: 如 [["str8","str8","str6"], ["str8","str8","str2"]]
-    :return: 第一个满足的 group（列表），都不满足返回 None
-    """
-    picture_dir = Path(picture_dir)
-    for group in groups:
-        if check_group_satisfied(region, group, picture_dir, threshold, min_distance):
-            return group
-    return None
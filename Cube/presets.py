@@ -0,0 +1,102 @@
+"""
+Cube 单属性脚本（int.py、str.py、atk12.py …）的预设表与通用运行器。
+
+每个预设由若干条件组成，条件之间为或逻辑；一个条件为 (模板名元组, 需要的命中次数)，
+命中次数是这些模板在画面上全部不重叠命中位置之和（同一张图的不同位置各算一次）。
+模板名即 picture/ 下的文件名（不含 .png）。各脚本只需 run_preset("名称")。
+"""
+from pathlib import Path
+
+try:
+    import winsound
+    HAS_WINSOUND = True
+except ImportError:
+    HAS_WINSOUND = False
+
+from click_sequence import activate_window, perform_click_sequence
+from cube_logic import MATCH_THRESHOLD, MIN_MATCH_DISTANCE, SEARCH_REGION, count_key_hits
+
+BASE_DIR = Path(__file__).parent
+PICTURE_DIR = BASE_DIR / "picture"
+
+# 终止时 beep 的默认时长（毫秒），预设可用 beep_ms 覆盖
+DEFAULT_BEEP_MS = 1000
+
+_STR_200 = ("all5", "all6", "str1", "str2", "str6", "str8", "cri1")
+
+PRESETS = {
+    "atk12": {"conditions": [(("atk12", "atk9"), 2)], "beep_ms": 200},
+    "atk13": {"conditions": [(("atk13",), 2)], "beep_ms": 200},
+    "cd": {"conditions": [(("cd-1",), 2)], "beep_ms": 200},
+    "dex": {"conditions": [(("dex2", "dex8"), 2)]},
+    "general": {"conditions": [
+        (_STR_200, 3),
+        (("int2", "int8"), 3),
+        (("dex2", "dex8"), 3),
+        (("luk2", "luk8"), 3),
+    ]},
+    "green": {"conditions": [(("green",), 1)]},
+    "int": {"conditions": [(("int8",), 2)]},
+    "int250": {"conditions": [(("int9",), 2)]},
+    "int3": {"conditions": [(("int3",), 2)]},
+    "magic12": {"conditions": [(("magic13", "magic10"), 2)], "beep_ms": 200},
+    "magic13": {"conditions": [(("magic13", "magic10"), 2)], "beep_ms": 200},
+    "str": {"conditions": [(_STR_200, 3)]},
+    "str200x2": {"conditions": [(("str2", "str8"), 2)]},
+    "str250": {"conditions": [(("all6u", "all7", "str1", "str2", "str7", "str9", "cri1"), 3)]},
+    "str250x2": {"conditions": [(("str2", "str9"), 2)]},
+    "strx": {"conditions": [(("allx1", "allx2", "strx2", "strx3"), 3)]},
+}
+
+
+def preset_keys(preset):
+    """预设用到的全部模板名（去重，保持出现顺序）。"""
+    keys = []
+    for names, _ in preset["conditions"]:
+        for name in names:
+            if name not in keys:
+                keys.append(name)
+    return keys
+
+
+def evaluate_preset(preset, counts):
+    """
+    按命中次数表判断预设的各条件。
+    :param counts: {模板名: 命中次数}，见 cube_logic.count_key_hits
+    :return: [(模板名元组, 需要次数, 实际次数, 是否满足), ...]，顺序同 preset["conditions"]
+    """
+    results = []
+    for names, required in preset["conditions"]:
+        n = sum(counts.get(name, 0) for name in names)
+        results.append((names, required, n, n >= required))
+    return results
+
+
+def run_preset(name, region=SEARCH_REGION, picture_dir=PICTURE_DIR, log=print):
+    """
+    按预设循环洗魔方：每轮只截一次图，每个模板只匹配一次；任一条件满足则 beep 并结束，否则执行点击序列。
+    """
+    preset = PRESETS[name]
+    keys = preset_keys(preset)
+    log("开始查找图片...")
+    log("停止条件（满足任一即停止）：")
+    for names, required in preset["conditions"]:
+        log(f"  找到 {required} 次及以上 {' / '.join(names)}（可以是同一张图片的不同位置，或不同图片）")
+    log("")
+
+    activate_window(BASE_DIR, region)
+    while True:
+        counts = count_key_hits(region, keys, picture_dir, MATCH_THRESHOLD, MIN_MATCH_DISTANCE)
+        found = ", ".join(f"{k}×{n}" for k, n in counts.items() if n > 0) or "无"
+        log(f"\n找到 {sum(counts.values())} 次匹配（{found}）")
+
+        met = [r for r in evaluate_preset(preset, counts) if r[3]]
+        if met:
+            for names, required, n, _ in met:
+                log(f"✓ 找到 {n} 次 {' / '.join(names)} 匹配，达到阈值 {required}，停止任务")
+            if HAS_WINSOUND:
+                winsound.Beep(1000, preset.get("beep_ms", DEFAULT_BEEP_MS))
+            return counts
+        log("✗ 未满足停止条件，继续循环")
+        perform_click_sequence()
+        log("\n" + "=" * 50 + "\n")
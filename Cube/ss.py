@@ -1,12 +1,16 @@
-import pyautogui
-import cv2
-import numpy as np
+import sys
 import winsound
 import time
 from pathlib import Path
 
 from click_sequence import perform_click_sequence, activate_window
 
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import get_image_topleft_with_score
+
 # 获取当前脚本所在目录
 BASE_DIR = Path(__file__).parent
 
@@ -21,7 +25,7 @@ MATCH_THRESHOLD = 0.99
 
 
 def find_image_in_region():
-    """在指定区域内查找图片，使用OpenCV进行精确匹配
+    """在指定区域内查找图片（找图逻辑见 Utils.find_image）
     返回是否找到图片"""
     # 计算区域参数 (left, top, width, height)
     x1, y1, x2, y2 = SEARCH_REGION
@@ -40,48 +44,21 @@ def find_image_in_region():
     
     print(f"正在查找: {IMAGE_FILE}")
     
-    try:
-        # 截取屏幕指定区域
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        # 转换为numpy数组并转为灰度图
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        
-        # 读取模板图片
-        template = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            print(f"✗ 无法读取图片: {IMAGE_FILE}")
-            return False
-        
-        # 检查模板是否大于搜索区域
-        if template.shape[0] > height or template.shape[1] > width:
-            print(f"✗ 模板图片尺寸({template.shape[1]}x{template.shape[0]})大于搜索区域({width}x{height})")
-            return False
-        
-        # 使用模板匹配
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-        
-        print(f"  匹配分数: {max_val:.4f} (阈值: {MATCH_THRESHOLD})")
-        
-        # 检查是否超过阈值
-        if max_val >= MATCH_THRESHOLD:
-            # 计算实际屏幕坐标
-            actual_x = left + max_loc[0]
-            actual_y = top + max_loc[1]
-            print(f"✓ 找到图片: {IMAGE_FILE}")
-            print(f"  位置: ({actual_x}, {actual_y})")
-            print(f"  匹配分数: {max_val:.4f}")
-            return True
-        else:
-            print(f"✗ 未找到: {IMAGE_FILE} (匹配分数 {max_val:.4f} < 阈值 {MATCH_THRESHOLD})")
-            return False
-            
-    except Exception as e:
-        print(f"✗ 查找 {IMAGE_FILE} 时出错: {e}")
-        import traceback
-        traceback.print_exc()
+    topleft, max_val = get_image_topleft_with_score(SEARCH_REGION, img_path, MATCH_THRESHOLD)
+    if max_val is None:
+        print(f"✗ 无法读取图片或模板大于搜索区域: {IMAGE_FILE}")
         return False
+    
+    print(f"  匹配分数: {max_val:.4f} (阈值: {MATCH_THRESHOLD})")
+    
+    # 检查是否超过阈值
+    if topleft is not None:
+        print(f"✓ 找到图片: {IMAGE_FILE}")
+        print(f"  位置: ({topleft[0]}, {topleft[1]})")
+        print(f"  匹配分数: {max_val:.4f}")
+        return True
+    print(f"✗ 未找到: {IMAGE_FILE} (匹配分数 {max_val:.4f} < 阈值 {MATCH_THRESHOLD})")
+    return False
 
 
 if __name__ == "__main__":
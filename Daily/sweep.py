@@ -18,12 +18,24 @@ from Utils.find_image import (
     find_image_and_click_with_score,
     find_image_with_score,
 )
+from Utils.poll_scheduler import AdaptivePoller
 
 from tenebris import run_tenebris_loop
 
 BASE_DIR = Path(__file__).parent
 SEARCH_REGION = (0, 0, 1920, 1080)
 
+# 等待切换角色完成（btn_menu / btn_down 出现）的最长时间（秒），与原先最多找 40 次、每次间隔 3 秒相当
+SWITCH_TIMEOUT = 120
+# 等待时的轮询间隔（秒）：切换刚发起时快速轮询，之后逐步退避到原先的 3 秒
+SWITCH_POLL_FAST = 0.5
+SWITCH_POLL_BASE = 1.0
+SWITCH_POLL_SLOW = 3.0
+
+
+def _switch_poller():
+    return AdaptivePoller(SWITCH_POLL_FAST, SWITCH_POLL_BASE, SWITCH_POLL_SLOW)
+
 
 def _sleep_check_stop(stop_event, seconds):
     """分段 sleep，每 0.3 秒检查一次 stop_event，便于及时响应结束。"""
@@ -49,16 +61,18 @@ def sweep(log_callback=None, stop_event=None, role_index=None, tenebris_enabled=
     btn_down_path = BASE_DIR / "picture/btn_down.png"
     btn_menu_path = BASE_DIR / "picture/btn_menu.png"
 
-    # 1. 每 3 秒找图 btn_menu（不点击），找到即表示切换角色成功；最多找 40 次
+    # 1. 轮询找图 btn_menu（不点击），找到即表示切换角色成功；最多等 SWITCH_TIMEOUT 秒
     last_score = None
-    for attempt in range(1, 41):
+    poller = _switch_poller()
+    deadline = time.monotonic() + SWITCH_TIMEOUT
+    while time.monotonic() < deadline:
         if stop_event is not None and stop_event.is_set():
             return
         found, max_val = find_image_with_score(region, btn_menu_path, threshold=0.95)
         if found:
             break
         last_score = max_val
-        _sleep_check_stop(stop_event, 3)
+        _sleep_check_stop(stop_event, poller.next_interval(changed=False))
     else:
         score_msg = f"，最高匹配阈值: {last_score:.3f}" if last_score is not None else ""
         _log("错误，切角色卡住了哥" + score_msg)
@@ -70,9 +84,11 @@ def sweep(log_callback=None, stop_event=None, role_index=None, tenebris_enabled=
         if stop_event is not None and stop_event.is_set():
             return
 
-    # 3. 找图 btn_down 并点击，进入扫荡主流程；最多找 40 次
+    # 3. 轮询找图 btn_down 并点击，进入扫荡主流程；最多等 SWITCH_TIMEOUT 秒
     last_score = None
-    for attempt in range(1, 41):
+    poller = _switch_poller()
+    deadline = time.monotonic() + SWITCH_TIMEOUT
+    while time.monotonic() < deadline:
         if stop_event is not None and stop_event.is_set():
             return
         found, max_val = find_image_and_click_with_score(region, btn_down_path, threshold=0.95)
@@ -82,7 +98,7 @@ def sweep(log_callback=None, stop_event=None, role_index=None, tenebris_enabled=
                 _log(f"开始扫荡第{role_index}个角色。")
             break
         last_score = max_val
-        _sleep_check_stop(stop_event, 3)
+        _sleep_check_stop(stop_event, poller.next_interval(changed=False))
     else:
         score_msg = f"，最高匹配阈值: {last_score:.3f}" if last_score is not None else ""
         _log("错误，切角色卡住了哥" + score_msg)
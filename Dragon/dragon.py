@@ -21,6 +21,15 @@ if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
 from Utils.find_image import find_image_and_click, get_image_center
+from Utils.frame import Frame
+from Utils.frame_gate import FrameGate
+from Utils.poll_scheduler import AdaptivePoller
+
+# 退场图监控的轮询间隔（秒）：退场流程刚结束时 fast，画面有变化时 base，
+# 画面不变或退场流程进行中时逐步退避，上限不超过原先固定的 3 秒
+RETREAT_POLL_FAST = 0.5
+RETREAT_POLL_BASE = 1.5
+RETREAT_POLL_SLOW = 3.0
 
 
 def _key_down(key: str) -> None:
@@ -71,6 +80,19 @@ def _wait(seconds: float, stop_event: threading.Event, stop_key: str) -> bool:
     return True
 
 
+def _wait_poll(seconds: float, stop_event: threading.Event, stop_key: str, poller: AdaptivePoller) -> bool:
+    """同 _wait，但其他线程 kick 了 poller 时提前结束等待（返回 True），以便立即按快速间隔轮询。"""
+    start = time.monotonic()
+    deadline = start + max(0.0, seconds)
+    while time.monotonic() < deadline:
+        if _should_stop(stop_event, stop_key):
+            return False
+        if poller.last_kick > start:
+            return True
+        time.sleep(0.05)
+    return True
+
+
 def _search_rect() -> tuple[int, int, int, int]:
     w, h = pyautogui.size()
     return 0, 0, int(w), int(h)
@@ -118,20 +140,32 @@ def _monitor_retreat(
     retreat_event: threading.Event,
     stop_event: threading.Event,
     stop_key: str,
+    poller: AdaptivePoller,
 ) -> None:
+    """
+    监控退场图，命中后置位 retreat_event。poller 与工作线程共用：
+    工作线程执行完退场流程后才清除 retreat_event 并 kick()，之后一段时间内快速轮询。
+    """
     rect = _search_rect()
     target = pictures["retreat"]
+    gate = FrameGate()
     while not _should_stop(stop_event, stop_key):
-        try:
-            if get_image_center(rect, target) is not None:
-                retreat_event.set()
-        except Exception:
-            pass
-        # 每 3 秒查一次，但保持可快速响应停止
-        for _ in range(60):
-            if _should_stop(stop_event, stop_key):
-                return
-            time.sleep(0.05)
+        changed = False
+        # 退场事件尚未处理完（流程进行中）时无需再找；画面与上次找图时相同则结果不变
+        if not retreat_event.is_set():
+            try:
+                frame = Frame.grab(rect)
+                changed = gate.changed(frame)
+                if changed:
+                    gate.accept(frame)
+                    if get_image_center(frame, target) is not None:
+                        retreat_event.set()
+                        gate.invalidate()
+            except Exception:
+                changed = True
+        # 按自适应间隔等待，但保持可快速响应停止
+        if not _wait_poll(poller.next_interval(changed), stop_event, stop_key, poller):
+            return
 
 
 def _handle_retreat_flow(
@@ -528,9 +562,10 @@ class DragonApp:
         except Exception:
             pass
 
+        self.retreat_poller = AdaptivePoller(RETREAT_POLL_FAST, RETREAT_POLL_BASE, RETREAT_POLL_SLOW)
         self.monitor = threading.Thread(
             target=_monitor_retreat,
-            args=(self.pictures, self.retreat_event, self.stop_event, self.stop_key),
+            args=(self.pictures, self.retreat_event, self.stop_event, self.stop_key, self.retreat_poller),
             daemon=True,
             name="retreat-monitor",
         )
@@ -607,6 +642,7 @@ class DragonApp:
                 self.root.after(0, lambda: self._log("2秒后开始攻击"))
                 if not _wait(2.0, self.stop_event, self.stop_key):
                     return
+            self.retreat_poller.kick()
 
             while not _should_stop(self.stop_event, self.stop_key):
                 end_at = time.time() + max(0.0, self.attack_duration_seconds)
@@ -619,7 +655,6 @@ class DragonApp:
                     time.sleep(max(0.0, self.tap_interval_seconds))
 
                 if self.retreat_event.is_set():
-                    self.retreat_event.clear()
                     self.root.after(0, lambda: self._log("准备回家"))
                     _handle_retreat_flow(
                         pictures=self.pictures,
@@ -634,6 +669,9 @@ class DragonApp:
                     self.root.after(0, lambda: self._log("退场流程结束"))
                     if not _wait(2.0, self.stop_event, self.stop_key):
                         return
+                    # 流程结束后才清除事件（流程中退场图仍可见，提前清除会被监控线程重复触发），并让监控线程快速轮询
+                    self.retreat_event.clear()
+                    self.retreat_poller.kick()
                     continue
 
                 time.sleep(0.5)
@@ -17,10 +17,14 @@ except ImportError:
 # 导入 enchant_level 的核心逻辑
 from enchant_level import run_enchant_level_loop, find_image_and_click
 # 导入 enchant_ability 的核心逻辑
-from enchant_ability import find_image_in_region, perform_click_sequence
+from enchant_ability import SEARCH_REGION, count_image, perform_click_sequence
+from enchant_rules import STATS, AbilityRules, count_vector, format_counts
 import sys
 import os
 
+from Utils.find_image import Frame
+from Utils.selectivity import HitRateTracker, evaluate_groups
+
 def get_resource_path(relative_path):
     """获取资源文件的绝对路径，兼容PyInstaller打包后的exe"""
     try:
@@ -571,100 +575,42 @@ def run_enchant_ability_loop(stop_event, status_callback, log_callback=None, con
     if condition_flags is None:
         condition_flags = {}
     
-    # 从 condition_flags 中获取各个条件的启用状态
-    enable_c1 = condition_flags.get('c1', False)  # 三攻
-    enable_c2 = condition_flags.get('c2', False)  # 双攻
-    enable_c3 = condition_flags.get('c3', False)  # 双攻全
-    enable_c4 = condition_flags.get('c4', False)  # 双攻力
-    enable_c5 = condition_flags.get('c5', False)  # 双攻敏
-    enable_c6 = condition_flags.get('c6', False)  # 双攻运
-    enable_c7 = condition_flags.get('c7', False)  # 双攻血
-    enable_c8 = condition_flags.get('c8', False)  # 单攻全
-    enable_c9 = condition_flags.get('c9', False)  # 单攻力
-    enable_c10 = condition_flags.get('c10', False)  # 单攻敏
-    enable_c11 = condition_flags.get('c11', False)  # 单攻运
-    enable_c12 = condition_flags.get('c12', False)  # 单攻血
-    enable_c13 = condition_flags.get('c13', False)  # 三魔
-    enable_c14 = condition_flags.get('c14', False)  # 双魔
-    enable_c15 = condition_flags.get('c15', False)  # 双魔智
-    enable_c16 = condition_flags.get('c16', False)  # 单魔智
-    
+    # 终止条件按勾选编译一次（规则表见 enchant_rules.py），每轮只对计数向量做一次判定
+    rules = AbilityRules(condition_flags)
+    # 按本次会话的命中率先匹配少见的词条，某条件已不可能满足就不再为它匹配
+    tracker = HitRateTracker()
+    # 使用静默的 log_callback 避免输出详细日志
+    silent_log = lambda msg: None
+
     find_count = 0
     
     try:
         while not stop_event.is_set():
             find_count += 1
-            # 使用静默的 log_callback 避免输出详细日志
-            silent_log = lambda msg: None
-            found_images = find_image_in_region(log_callback=silent_log)
-            
-            # 统计各种图片的找到次数
-            all_count = sum(1 for img in found_images if img['file'] == 'picture/all_enchant.png')
-            atk_count = sum(1 for img in found_images if img['file'] == 'picture/atk_enchant.png')
-            magic_count = sum(1 for img in found_images if img['file'] == 'picture/magic_enchant.png')
-            str_count = sum(1 for img in found_images if img['file'] == 'picture/str_enchant.png')
-            dex_count = sum(1 for img in found_images if img['file'] == 'picture/dex_enchant.png')
-            int_count = sum(1 for img in found_images if img['file'] == 'picture/int_enchant.png')
-            luk_count = sum(1 for img in found_images if img['file'] == 'picture/luk_enchant.png')
-            hp_count = sum(1 for img in found_images if img['file'] == 'picture/hp_enchant.png')
-            # 日志：按 攻、魔、全、力、敏、智、运、血 顺序显示
-            count_parts = []
-            for cnt, name in [(atk_count, '攻'), (magic_count, '魔'), (all_count, '全'),
-                             (str_count, '力'), (dex_count, '敏'), (int_count, '智'),
-                             (luk_count, '运'), (hp_count, '血')]:
-                if cnt > 0:
-                    count_parts.append(f"{cnt}{name}")
-            count_str = "，".join(count_parts) if count_parts else ""
-            log_callback(f"第{find_count}次，找到{count_str}" if count_parts else f"第{find_count}次，无有效词条，请检查内衬窗口位置！")
-            if not count_parts:
+            # 整轮只截一次图，词条按需逐个匹配
+            try:
+                frame = Frame.grab(SEARCH_REGION)
+            except Exception:
+                frame = None  # 截图失败，视为未找到任何词条
+            found = {}
+            if frame is not None:
+                probe = lambda key: count_image(frame, f'picture/{key}_enchant.png')
+                _, found = evaluate_groups(rules.groups, probe, tracker, STATS, exhaust_if_empty=True)
+            counts = count_vector(found)
+            satisfied = rules.satisfied(counts) is not None
+
+            # 日志：只显示本轮匹配过且命中的词条
+            count_str = format_counts(counts)
+            skipped = f"（跳过{tracker.last_skipped}个模板）" if frame is not None and tracker.last_skipped else ""
+            log_callback(f"第{find_count}次，找到{count_str}{skipped}" if count_str else f"第{find_count}次，无有效词条，请检查内衬窗口位置！")
+            if not count_str:
                 log_callback("任务已停止！")
                 status_callback("未找到任何图片，任务已停止")
                 break
-            # 全 等效为 力敏智运
-            str_with_all_count = str_count + all_count
-            dex_with_all_count = dex_count + all_count
-            int_with_all_count = int_count + all_count
-            luk_with_all_count = luk_count + all_count
-            
-            # 检查终止条件
-            condition1 = atk_count >= 3  # 三攻
-            condition2 = atk_count >= 2  # 双攻
-            condition3 = atk_count >= 2 and all_count >= 1  # 双攻全
-            condition4 = atk_count >= 2 and str_with_all_count >= 1  # 双攻力(全)
-            condition5 = atk_count >= 2 and dex_with_all_count >= 1  # 双攻敏(全)
-            condition6 = atk_count >= 2 and luk_with_all_count >= 1  # 双攻运(全)
-            condition7 = atk_count >= 2 and hp_count >= 1  # 双攻血
-            condition8 = atk_count >= 1 and all_count >= 2  # 单攻全
-            condition9 = atk_count >= 1 and str_with_all_count >= 2  # 单攻力(全)
-            condition10 = atk_count >= 1 and dex_with_all_count >= 2  # 单攻敏(全)
-            condition11 = atk_count >= 1 and luk_with_all_count >= 2  # 单攻运(全)
-            condition12 = atk_count >= 1 and hp_count >= 2  # 单攻血
-            condition13 = magic_count >= 3  # 三魔
-            condition14 = magic_count >= 2  # 双魔
-            condition15 = magic_count >= 2 and int_with_all_count >= 1  # 双魔智(全)
-            condition16 = magic_count >= 1 and int_with_all_count >= 2  # 单魔智(全)
-            
-            satisfied = (
-                (condition1 and enable_c1) or
-                (condition2 and enable_c2) or
-                (condition3 and enable_c3) or
-                (condition4 and enable_c4) or
-                (condition5 and enable_c5) or
-                (condition6 and enable_c6) or
-                (condition7 and enable_c7) or
-                (condition8 and enable_c8) or
-                (condition9 and enable_c9) or
-                (condition10 and enable_c10) or
-                (condition11 and enable_c11) or
-                (condition12 and enable_c12) or
-                (condition13 and enable_c13) or
-                (condition14 and enable_c14) or
-                (condition15 and enable_c15) or
-                (condition16 and enable_c16)
-            )
             
             if satisfied:
                 log_callback("满足条件，停止洗属性！")
+                log_callback("找图统计：" + tracker.format_stats())
                 import winsound
                 winsound.Beep(1000, 200)
                 status_callback("已满足终止条件，任务结束")
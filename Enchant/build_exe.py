@@ -62,6 +62,7 @@ cmd = [
     "--hidden-import=keyboard",  # 全局热键，需一并打包
     "--hidden-import=PIL",  # 确保PIL被包含
     "--hidden-import=PIL.Image",  # 确保PIL.Image被包含
+    f"--paths={ENCHANT_DIR.parent}",  # 项目根目录，打包 Utils（截图后端等）
     "--add-data=picture;picture",  # 打包picture目录
     f"--name={NAME}",
     "--clean",
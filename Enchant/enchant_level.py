@@ -1,17 +1,9 @@
 import pyautogui
-import cv2
-import numpy as np
 import winsound
+import sys
 import time
 from pathlib import Path
 
-# 尝试导入 PIL/Pillow 作为 cv2 读取失败时的回退
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
-
 # 尝试导入 keyboard 库用于发送按键（更可靠）
 try:
     import keyboard
@@ -19,6 +11,13 @@ try:
 except ImportError:
     HAS_KEYBOARD = False
 
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import get_image_center_with_score
+from Utils.template_bank import TemplateBank, TemplateBankError
+
 # 获取当前脚本所在目录
 BASE_DIR = Path(__file__).parent
 
@@ -31,66 +30,27 @@ IMAGE_FILE = 'picture/level4.png'
 # 匹配阈值（0-1之间，越高越严格，建议0.95以上）
 MATCH_THRESHOLD = 0.99
 
+_level_bank = None
+
+
+def load_level_bank():
+    """加载上绿用到的模板（首次调用时读取，之后复用）。模板缺失或过大时抛出 TemplateBankError"""
+    global _level_bank
+    if _level_bank is None:
+        size = (SEARCH_REGION[2] - SEARCH_REGION[0], SEARCH_REGION[3] - SEARCH_REGION[1])
+        _level_bank = TemplateBank({IMAGE_FILE: BASE_DIR / IMAGE_FILE}, max_size=size)
+    return _level_bank
+
 
 def find_image_in_region(log_callback=None):
-    """在指定区域内查找图片，使用OpenCV进行精确匹配
+    """在指定区域内查找 level4（模板取自预加载的模板库，不再逐次读取图片；画面上只有一处，先在上次命中位置附近找）
     返回是否找到图片"""
-    if log_callback is None:
-        log_callback = lambda msg: print(msg)
-    
-    # 计算区域参数 (left, top, width, height)
-    x1, y1, x2, y2 = SEARCH_REGION
-    left = x1
-    top = y1
-    width = x2 - x1
-    height = y2 - y1
-    
-    img_path = BASE_DIR / IMAGE_FILE
-    
-    if not img_path.exists():
-        return False
-    
     try:
-        # 截取屏幕指定区域
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        # 转换为numpy数组并转为灰度图
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        
-        # 读取模板图片
-        img_path_str = str(img_path.resolve())
-        template = cv2.imread(img_path_str, cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            # 如果cv2读取失败，尝试使用PIL读取
-            if HAS_PIL:
-                try:
-                    pil_img = Image.open(img_path_str)
-                    # 转换为灰度图
-                    if pil_img.mode != 'L':
-                        pil_img = pil_img.convert('L')
-                    # 转换为numpy数组
-                    template = np.array(pil_img)
-                except Exception:
-                    return False
-            else:
-                return False
-        
-        # 检查模板是否大于搜索区域
-        if template.shape[0] > height or template.shape[1] > width:
-            return False
-        
-        # 使用模板匹配
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-        
-        # 检查是否超过阈值
-        if max_val >= MATCH_THRESHOLD:
-            return True
-        else:
-            return False
-            
-    except Exception as e:
+        bank = load_level_bank()
+    except TemplateBankError:
         return False
+    topleft, _, _ = bank.find_best(SEARCH_REGION, IMAGE_FILE, MATCH_THRESHOLD, roi=True)
+    return topleft is not None
 
 
 def find_image_and_click(image_file, threshold=0.99, log_callback=None):
@@ -99,12 +59,6 @@ def find_image_and_click(image_file, threshold=0.99, log_callback=None):
     if log_callback is None:
         log_callback = lambda msg: print(msg)
     
-    x1, y1, x2, y2 = SEARCH_REGION
-    left = x1
-    top = y1
-    width = x2 - x1
-    height = y2 - y1
-    
     img_path = BASE_DIR / image_file
     
     if not img_path.exists():
@@ -114,60 +68,27 @@ def find_image_and_click(image_file, threshold=0.99, log_callback=None):
     log_callback(f"正在查找: {image_file}")
     
     try:
-        # 截取屏幕指定区域
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        # 转换为numpy数组并转为灰度图
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        
-        # 读取模板图片
-        img_path_str = str(img_path.resolve())
-        template = cv2.imread(img_path_str, cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            # 如果cv2读取失败，尝试使用PIL读取
-            if HAS_PIL:
-                try:
-                    pil_img = Image.open(img_path_str)
-                    # 转换为灰度图
-                    if pil_img.mode != 'L':
-                        pil_img = pil_img.convert('L')
-                    # 转换为numpy数组
-                    template = np.array(pil_img)
-                except Exception:
-                    log_callback(f"✗ 无法读取图片: {image_file}")
-                    return False
-            else:
-                log_callback(f"✗ 无法读取图片: {image_file}")
-                return False
-        
-        # 检查模板是否大于搜索区域
-        if template.shape[0] > height or template.shape[1] > width:
-            log_callback(f"✗ 模板图片尺寸({template.shape[1]}x{template.shape[0]})大于搜索区域({width}x{height})")
+        center, max_val = get_image_center_with_score(SEARCH_REGION, img_path, threshold)
+        if max_val is None:
+            log_callback(f"✗ 无法读取图片或模板大于搜索区域: {image_file}")
             return False
         
-        # 使用模板匹配
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-        
         log_callback(f"  匹配分数: {max_val:.4f} (阈值: {threshold})")
         
         # 检查是否超过阈值
-        if max_val >= threshold:
-            # 计算实际屏幕坐标（图片中心点）
-            center_x = left + max_loc[0] + template.shape[1] // 2
-            center_y = top + max_loc[1] + template.shape[0] // 2
-            log_callback(f"✓ 找到图片: {image_file}")
-            log_callback(f"  位置: ({center_x}, {center_y})")
-            log_callback(f"  匹配分数: {max_val:.4f}")
-            # 点击图片中心
-            pyautogui.click(center_x, center_y)
-            log_callback(f"  已点击: ({center_x}, {center_y})")
-            # 点击后鼠标右移100像素
-            pyautogui.moveRel(100, 0)
-            return True
-        else:
+        if center is None:
             log_callback(f"✗ 未找到: {image_file} (匹配分数 {max_val:.4f} < 阈值 {threshold})")
             return False
+        center_x, center_y = center
+        log_callback(f"✓ 找到图片: {image_file}")
+        log_callback(f"  位置: ({center_x}, {center_y})")
+        log_callback(f"  匹配分数: {max_val:.4f}")
+        # 点击图片中心
+        pyautogui.click(center_x, center_y)
+        log_callback(f"  已点击: ({center_x}, {center_y})")
+        # 点击后鼠标右移100像素
+        pyautogui.moveRel(100, 0)
+        return True
             
     except Exception as e:
         log_callback(f"✗ 查找 {image_file} 时出错: {e}")
@@ -201,9 +122,18 @@ def run_enchant_level_loop(stop_event, status_callback, log_callback=None):
     count = 0
     
     try:
+        # 开始前加载模板，缺失时直接报错而不是一直找不到
+        try:
+            load_level_bank()
+        except TemplateBankError as e:
+            log_callback(f"错误：{e}")
+            status_callback("错误：模板加载失败，请检查 picture 目录！")
+            return
         while not stop_event.is_set():
             # 查找图片
+            t0 = time.perf_counter()
             found = find_image_in_region(log_callback=log_callback)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
             
             if found:
                 winsound.Beep(1000, 300)  # 频率1000Hz，持续时间300ms
@@ -211,7 +141,7 @@ def run_enchant_level_loop(stop_event, status_callback, log_callback=None):
                 break
             else:
                 count += 1
-                log_callback(f"第{count}次")
+                log_callback(f"第{count}次（找图{elapsed_ms:.0f}ms）")
                 # 执行点击序列
                 perform_click_sequence(log_callback=log_callback)
                 
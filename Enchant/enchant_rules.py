@@ -0,0 +1,79 @@
+"""
+洗属性终止条件的规则表：条件写成数据（词条 -> 最少次数），开始时按勾选编译一次，
+每轮用一次向量化比较对词条计数向量做判定。新增终止条件只需在 RULES 里加一行。
+"""
+import numpy as np
+
+# 词条（对应 picture/{词条}_enchant.png）及日志显示名，日志按此顺序显示
+STATS = ("atk", "magic", "all", "str", "dex", "int", "luk", "hp")
+STAT_LABELS = ("攻", "魔", "全", "力", "敏", "智", "运", "血")
+
+# 规则中的词条按下表换算后再比较：全 等效为 力敏智运，例如规则里的 str 实际统计 str + all
+ALIASES = {
+    "str": ("str", "all"),
+    "dex": ("dex", "all"),
+    "int": ("int", "all"),
+    "luk": ("luk", "all"),
+}
+
+# 终止条件：条件编号 -> {词条: 最少次数}，词条之间为与逻辑
+RULES = {
+    "c1": {"atk": 3},  # 三攻
+    "c2": {"atk": 2},  # 双攻
+    "c3": {"atk": 2, "all": 1},  # 双攻全
+    "c4": {"atk": 2, "str": 1},  # 双攻力(全)
+    "c5": {"atk": 2, "dex": 1},  # 双攻敏(全)
+    "c6": {"atk": 2, "luk": 1},  # 双攻运(全)
+    "c7": {"atk": 2, "hp": 1},  # 双攻血
+    "c8": {"atk": 1, "all": 2},  # 单攻全
+    "c9": {"atk": 1, "str": 2},  # 单攻力(全)
+    "c10": {"atk": 1, "dex": 2},  # 单攻敏(全)
+    "c11": {"atk": 1, "luk": 2},  # 单攻运(全)
+    "c12": {"atk": 1, "hp": 2},  # 单攻血
+    "c13": {"magic": 3},  # 三魔
+    "c14": {"magic": 2},  # 双魔
+    "c15": {"magic": 2, "int": 1},  # 双魔智(全)
+    "c16": {"magic": 1, "int": 2},  # 单魔智(全)
+}
+
+STAT_INDEX = {stat: i for i, stat in enumerate(STATS)}
+
+# 换算矩阵：_ALIAS[i, j] = 1 表示规则词条 STATS[i] 计入实际词条 STATS[j] 的次数
+_ALIAS = np.eye(len(STATS), dtype=np.int32)
+for _name, _sources in ALIASES.items():
+    _ALIAS[STAT_INDEX[_name]] = 0
+    _ALIAS[STAT_INDEX[_name], [STAT_INDEX[s] for s in _sources]] = 1
+
+
+def count_vector(counts):
+    """{词条: 次数}（未出现视为 0）转为长度同 STATS 的计数向量。"""
+    return np.array([counts.get(stat, 0) for stat in STATS], dtype=np.int32)
+
+
+def format_counts(counts):
+    """计数向量的日志串，如 '2攻，1全'；全为 0 时返回空串。"""
+    return "，".join(f"{n}{label}" for n, label in zip(counts.tolist(), STAT_LABELS) if n > 0)
+
+
+class AbilityRules:
+    """
+    按勾选编译好的终止条件。
+    condition_flags: {'c1': bool, ..., 'c16': bool}
+    matrix: (已启用条件数, 词条数) 的最少次数矩阵，列为换算后的词条；
+    groups: 同一组条件的 Utils.selectivity.evaluate_groups 格式，供按命中率逐个匹配词条时提前退出。
+    """
+
+    def __init__(self, condition_flags):
+        self.enabled = tuple(c for c in RULES if condition_flags.get(c, False))
+        self.matrix = np.array([[RULES[c].get(stat, 0) for stat in STATS] for c in self.enabled],
+                               dtype=np.int32).reshape(len(self.enabled), len(STATS))
+        self.groups = [[(ALIASES.get(stat, (stat,)), n) for stat, n in RULES[c].items()] for c in self.enabled]
+
+    def satisfied(self, counts):
+        """
+        对计数向量判定，返回第一个满足的条件编号，都不满足返回 None。
+        counts 中未匹配的词条按 0 计，只会少判不会误判。
+        """
+        effective = _ALIAS @ counts
+        met = np.all(effective >= self.matrix, axis=1)
+        return self.enabled[int(np.argmax(met))] if met.any() else None
@@ -20,6 +20,7 @@ except Exception:
     HAS_KEYBOARD = False
 
 from fire_logic import run_fire_loop
+from Utils.find_image import enable_profiling, format_profile, profiling_enabled
 
 _FIRE_DIR = Path(__file__).resolve().parent
 
@@ -387,6 +388,16 @@ class FireApp:
     def _bind_keys(self) -> None:
         self.root.bind("<F11>", lambda _e: self.start())
         self.root.bind("<F12>", lambda _e: self.stop())
+        self.root.bind("<F10>", lambda _e: self._dump_find_profile())
+
+    def _dump_find_profile(self) -> None:
+        """F10：首次按下开启找图耗时统计，之后每次把统计输出到日志。"""
+        if not profiling_enabled():
+            enable_profiling(True)
+            self._log_append("已开启找图统计，再按 F10 输出到日志")
+            return
+        for line in format_profile().splitlines():
+            self._log_append(line)
 
     def _register_global_hotkeys(self) -> None:
         if not HAS_KEYBOARD or keyboard is None:
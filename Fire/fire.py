@@ -52,7 +52,7 @@ def _activate_window_by_flag(pic_dir: Path, rect: tuple[int, int, int, int]) ->
     if not flag.is_file():
         print(f"警告：未找到激活图 {flag}")
         return False
-    center = get_image_center(rect, flag)
+    center = get_image_center(rect, flag, roi=True)
     if center is None:
         return False
     x, y = center[0], center[1] + 50
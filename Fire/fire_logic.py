@@ -30,7 +30,8 @@ except Exception:  # pragma: no cover
     winsound = None
     HAS_WINSOUND = False
 
-from Utils.find_image import get_image_center
+from Utils.find_image import Frame, get_image_center
+from Utils.selectivity import HitRateTracker, evaluate_groups
 
 
 def _press_space_twice() -> None:
@@ -74,7 +75,7 @@ def activate_window_by_flag(fire_dir: Path, offset_y: int = 50) -> bool:
     flag = pic_dir / "flag.png"
     if not flag.is_file():
         return False
-    center = get_image_center(rect, flag)
+    center = get_image_center(rect, flag, roi=True)
     if center is None:
         return False
     pyautogui.click(center[0], center[1] + int(offset_y))
@@ -82,47 +83,36 @@ def activate_window_by_flag(fire_dir: Path, offset_y: int = 50) -> bool:
     return True
 
 
-def _found(pic_dir: Path, rect: tuple[int, int, int, int], key: str) -> bool:
-    p = pic_dir / f"{key}.png"
-    if not p.is_file():
-        return False
-    return get_image_center(rect, p) is not None
+def _found(pic_dir: Path, rect, key: str) -> bool:
+    """rect 为 (x1, y1, x2, y2) 或已截好的 Frame；模板缺失时视为未找到（由 Utils.find_image 的模板缓存处理）。"""
+    return get_image_center(rect, pic_dir / f"{key}.png") is not None
 
 
-def check_group_satisfied(pic_dir: Path, rect: tuple[int, int, int, int], group: list[str]) -> bool:
-    """一组条件满足：组内每个 key 都能在屏幕上找到。"""
-    for key in group:
-        if key == "any":
-            continue
-        if not _found(pic_dir, rect, key):
-            return False
-    return True
+def _as_terms(groups: list[list[str]]) -> list[list[tuple[tuple[str, ...], int]]]:
+    """Fire 的组（组内每个 key 都要找到）转为 Utils.selectivity.evaluate_groups 的格式。"""
+    return [[((key,), 1) for key in g if key != "any"] for g in groups or []]
+
+
+def evaluate_round(
+    pic_dir: Path,
+    rect: tuple[int, int, int, int],
+    groups: list[list[str]],
+    tracker: Optional[HitRateTracker] = None,
+) -> tuple[Optional[list[str]], list[str]]:
+    """
+    一轮判定：只截一次图，满足判定与命中日志出自同一遍匹配。
+    按本次会话的命中率先找少见的 key，组内有 key 没找到就放弃该组，其余组都不需要的 key 不再找。
+    :param rect: (x1, y1, x2, y2) 或已截好的 Frame
+    :return: (第一个满足的组或 None, 本轮找过且命中的 key)
+    """
+    frame = rect if isinstance(rect, Frame) else Frame.grab(rect)
+    idx, counts = evaluate_groups(_as_terms(groups), lambda key: int(_found(pic_dir, frame, key)), tracker)
+    hits = [key for key, n in counts.items() if n > 0]
+    return (groups[idx] if idx is not None else None), hits
 
 
 def check_any_group_satisfied(pic_dir: Path, rect: tuple[int, int, int, int], groups: list[list[str]]) -> Optional[list[str]]:
-    for g in groups or []:
-        if check_group_satisfied(pic_dir, rect, g):
-            return g
-    return None
-
-
-def find_target_hits(pic_dir: Path, rect: tuple[int, int, int, int], groups: list[list[str]]) -> list[str]:
-    """统计本轮“目标集”(groups 内出现过的 key)命中了哪些。"""
-    targets: list[str] = []
-    seen = set()
-    for g in groups or []:
-        for key in g:
-            if key == "any":
-                continue
-            if key in seen:
-                continue
-            seen.add(key)
-            targets.append(key)
-    hits: list[str] = []
-    for key in targets:
-        if _found(pic_dir, rect, key):
-            hits.append(key)
-    return hits
+    return evaluate_round(pic_dir, rect, groups)[0]
 
 
 def run_fire_loop(
@@ -159,6 +149,8 @@ def run_fire_loop(
 
         n = 0
         equip = (equipment_type or "").strip()
+        tracker = HitRateTracker()
+        loop_start = time.perf_counter()  # 用于日志里的“轮/秒”（含按键与等待）
         while not stop_event.is_set():
             n += 1
             if not termination_groups:
@@ -172,22 +164,29 @@ def run_fire_loop(
             if equip == "武器":
                 groups = [[*g, "+28"] if "+28" not in g else list(g) for g in (termination_groups or [])]
 
-            satisfied = check_any_group_satisfied(pic_dir, rect, groups)
+            t0 = time.perf_counter()
+            satisfied, hits = evaluate_round(pic_dir, rect, groups, tracker)
+            now = time.perf_counter()
+            timing = f"找图{(now - t0) * 1000:.0f}ms，{n / max(now - loop_start, 1e-6):.2f}轮/秒"
             if satisfied is not None:
-                log_callback(f"第{n}次，命中：[{', '.join(satisfied)}]，停止")
+                log_callback(f"第{n}次，命中：[{', '.join(satisfied)}]，停止（{timing}）")
+                log_callback("找图统计：" + tracker.format_stats())
                 _beep_found()
                 status_callback("已命中终止条件，任务结束")
                 return
 
-            hits = find_target_hits(pic_dir, rect, groups)
+            skipped = f"跳过{tracker.last_skipped}个模板，" if tracker.last_skipped else ""
+            extra = f"（{skipped}{timing}）"
             if hits:
-                log_callback(f"第{n}次，找到：{', '.join(hits)}")
+                log_callback(f"第{n}次，找到：{', '.join(hits)}{extra}")
             else:
-                log_callback(f"第{n}次，未找到目标属性")
+                log_callback(f"第{n}次，未找到目标属性{extra}")
 
             _press_space_twice()
             time.sleep(0.5)
 
+        if tracker.rounds:
+            log_callback("找图统计：" + tracker.format_stats())
         status_callback("已手动停止")
     except Exception as e:
         status_callback(f"运行出错: {e}")
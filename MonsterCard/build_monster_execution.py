@@ -22,8 +22,12 @@ from monster_ability import (
     perform_click_sequence_recovery,
     check_image_exists,
     find_all_matches,
+    find_images_in_boxes,
+    load_template_bank,
+    TemplateBankError,
     AFTER_BOX_W,
     AFTER_BOX_H,
+    SEARCH_REGION,
 )
 import winsound
 from pathlib import Path
@@ -31,6 +35,8 @@ import sys
 import os
 
 from monster_bag import run_bag_loop
+from monster_rules import MonsterConditions, count_vector, format_counts
+from Utils.find_image import Frame, enable_profiling, format_profile, profiling_enabled
 
 def get_resource_path(relative_path):
     """获取资源文件的绝对路径，兼容PyInstaller打包后的exe"""
@@ -52,17 +58,26 @@ def run_monster_loop(stop_event, status_callback, log_callback=None, condition_f
         log_callback = lambda msg: None
     if condition_flags is None:
         condition_flags = (True, False, True, True, True, True, (True,)*12)
-    enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7, c3_sub_flags = condition_flags
-    enable_c3_1, enable_c3_2, enable_c3_3, enable_c3_4, enable_c3_5, enable_c3_6, enable_c3_7, enable_c3_8, enable_c3_9, enable_c3_10, enable_c3_11, enable_c3_12 = c3_sub_flags
     
+    # 开始前一次性加载并校验词条模板，模板缺失或过大时直接报错，而不是每轮静默跳过
+    try:
+        load_template_bank("three" if cube_type == "怪怪恢复魔方(一次洗三个)" else "one")
+    except TemplateBankError as e:
+        log_callback(f"错误：{e}")
+        status_callback("错误：词条模板加载失败，请检查 picture 目录！")
+        return
+
     # 在开始循环前，检查是否找到强化动画图片
     if check_image_exists("picture/graphic.png", log_callback=log_callback):
         log_callback("错误：请关闭强化动画！")
         status_callback("错误：请关闭强化动画！")
         return
 
+    # 终止条件按勾选编译一次，之后每轮只对计数向量做一次判定（规则表见 monster_rules.py）
+    conditions = MonsterConditions(condition_flags)
+
     if cube_type == "怪怪恢复魔方(一次洗三个)":
-        _run_monster_loop_recovery(stop_event, status_callback, log_callback, condition_flags)
+        _run_monster_loop_recovery(stop_event, status_callback, log_callback, conditions)
         return
     
     find_count = 0
@@ -71,99 +86,18 @@ def run_monster_loop(stop_event, status_callback, log_callback=None, condition_f
             find_count += 1
             found_images = find_image_in_region(log_callback=log_callback)
 
-            final_count = sum(1 for img in found_images if img["file"].endswith("final.png"))
-            monster_atk_count = sum(1 for img in found_images if img["file"].endswith("monster_atk.png"))
-            monster_magic_count = sum(1 for img in found_images if img["file"].endswith("monster_magic.png"))
-            skill_2_count = sum(1 for img in found_images if img["file"].endswith("skill_2.png"))
-            monster_all_count = sum(1 for img in found_images if img["file"].endswith("monster_all.png"))
-            monster_str_count = sum(1 for img in found_images if img["file"].endswith("monster_str.png"))
-            monster_dex_count = sum(1 for img in found_images if img["file"].endswith("monster_dex.png"))
-            monster_int_count = sum(1 for img in found_images if img["file"].endswith("monster_int.png"))
-            monster_luk_count = sum(1 for img in found_images if img["file"].endswith("monster_luk.png"))
-            monster_cri_count = sum(1 for img in found_images if img["file"].endswith("monster_cri.png"))
-            monster_hp_count = sum(1 for img in found_images if img["file"].endswith("monster_hp.png"))
-            monster_ignore_count = sum(1 for img in found_images if img["file"].endswith("monster_ignore.png"))
-            monster_buff_count = sum(1 for img in found_images if img["file"].endswith("monster_buff.png"))
-
-            # 按照指定顺序和名称映射构建日志
-            count_items = [
-                (final_count, "终"),
-                (monster_atk_count, "攻"),
-                (monster_magic_count, "魔"),
-                (skill_2_count, "被"),
-                (monster_all_count, "全"),
-                (monster_str_count, "力"),
-                (monster_dex_count, "敏"),
-                (monster_int_count, "智"),
-                (monster_luk_count, "运"),
-                (monster_cri_count, "爆"),
-                (monster_hp_count, "血"),
-                (monster_ignore_count, "无视"),
-                (monster_buff_count, "buff"),
-            ]
-            
-            # 过滤出count > 0的项
-            found_items = [(count, name) for count, name in count_items if count > 0]
-            
-            if not found_items:
+            counts = count_vector(found_images)
+            result_str = format_counts(counts)
+            if not result_str:
                 # 所有图都没找到
                 log_callback(f"第{find_count}次，无有效词条")
             else:
-                # 构建输出字符串：数字+名称，用顿号分隔
-                result_parts = [f"{count}{name}" for count, name in found_items]
-                log_callback(f"第{find_count}次，找到{'、'.join(result_parts)}")
+                log_callback(f"第{find_count}次，找到{result_str}")
 
-            condition1 = final_count >= 3  # 三终（必选）
-            condition2 = final_count >= 2  # 双终0
-            
-            # 条件3的12个子条件
-            condition3_1 = condition2 and monster_atk_count >= 1  # 双终攻
-            condition3_2 = condition2 and monster_magic_count >= 1  # 双终魔
-            condition3_3 = condition2 and monster_all_count >= 1  # 双终全
-            condition3_4 = condition2 and monster_str_count >= 1  # 双终力
-            condition3_5 = condition2 and monster_dex_count >= 1  # 双终敏
-            condition3_6 = condition2 and monster_int_count >= 1  # 双终智
-            condition3_7 = condition2 and monster_luk_count >= 1  # 双终运
-            condition3_8 = condition2 and monster_cri_count >= 1  # 双终爆
-            condition3_9 = condition2 and monster_hp_count >= 1  # 双终血
-            condition3_10 = condition2 and monster_ignore_count >= 1  # 双终无视
-            condition3_11 = condition2 and monster_buff_count >= 1  # 双终buff
-            condition3_12 = condition2 and skill_2_count >= 1  # 双终被
-            
-            # 条件3：所有启用的子条件的并集
-            condition3 = (
-                (condition3_1 and enable_c3_1) or
-                (condition3_2 and enable_c3_2) or
-                (condition3_3 and enable_c3_3) or
-                (condition3_4 and enable_c3_4) or
-                (condition3_5 and enable_c3_5) or
-                (condition3_6 and enable_c3_6) or
-                (condition3_7 and enable_c3_7) or
-                (condition3_8 and enable_c3_8) or
-                (condition3_9 and enable_c3_9) or
-                (condition3_10 and enable_c3_10) or
-                (condition3_11 and enable_c3_11) or
-                (condition3_12 and enable_c3_12)
-            )
-            
-            condition4 = (monster_atk_count >= 2 or monster_magic_count >= 2) and skill_2_count >= 1  # 双攻被、双魔被
-            condition5 = final_count >= 1 and (monster_atk_count >= 2 or monster_magic_count >= 2)  # 双攻终、双魔终
-            condition6 = (
-                final_count >= 1
-                and skill_2_count >= 1
-                and (monster_atk_count >= 1 or monster_magic_count >= 1)
-            )  # 终攻被、终魔被
-            condition7 = monster_atk_count >= 3 or monster_magic_count >= 3  # 三攻、三魔
-
-            satisfied = condition1 or (condition2 and enable_c2) or (condition3 and enable_c3) or (condition4 and enable_c4) or (condition5 and enable_c5) or (condition6 and enable_c6) or (condition7 and enable_c7)
+            satisfied, play_wav = conditions.check(counts)
             if satisfied:
                 log_callback("满足条件，停止魔方！")
-                # 判断是否满足条件1、条件3_1或条件3_2
-                play_wav = (
-                    condition1 or
-                    (condition3_1 and enable_c3_1) or
-                    (condition3_2 and enable_c3_2)
-                )
+                # 满足条件1、条件3_1或条件3_2时播放狗叫
                 if play_wav:
                     # 额外输出日志
                     log_callback("沃日！狗叫！分钱！")
@@ -197,80 +131,18 @@ def run_monster_loop(stop_event, status_callback, log_callback=None, condition_f
 
 def _result_str_from_found_images(found_images):
     """根据 found_images 生成单框日志字符串，如 '1终、2攻' 或 '无'。"""
-    count_items = [
-        (sum(1 for img in found_images if img["file"].endswith("final.png")), "终"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_atk.png")), "攻"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_magic.png")), "魔"),
-        (sum(1 for img in found_images if img["file"].endswith("skill_2.png")), "被"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_all.png")), "全"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_str.png")), "力"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_dex.png")), "敏"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_int.png")), "智"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_luk.png")), "运"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_cri.png")), "爆"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_hp.png")), "血"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_ignore.png")), "无视"),
-        (sum(1 for img in found_images if img["file"].endswith("monster_buff.png")), "buff"),
-    ]
-    found_items = [(count, name) for count, name in count_items if count > 0]
-    result_parts = [f"{count}{name}" for count, name in found_items]
-    return "、".join(result_parts) if result_parts else "无"
-
-
-def _check_conditions_in_found_images(found_images, enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7,
-                                      enable_c3_1, enable_c3_2, enable_c3_3, enable_c3_4, enable_c3_5, enable_c3_6,
-                                      enable_c3_7, enable_c3_8, enable_c3_9, enable_c3_10, enable_c3_11, enable_c3_12):
-    """根据 found_images 列表计算各 count 并判断是否满足任一终止条件。返回 (satisfied, condition1, condition3_1, condition3_2) 用于音效。"""
-    final_count = sum(1 for img in found_images if img["file"].endswith("final.png"))
-    monster_atk_count = sum(1 for img in found_images if img["file"].endswith("monster_atk.png"))
-    monster_magic_count = sum(1 for img in found_images if img["file"].endswith("monster_magic.png"))
-    skill_2_count = sum(1 for img in found_images if img["file"].endswith("skill_2.png"))
-    monster_all_count = sum(1 for img in found_images if img["file"].endswith("monster_all.png"))
-    monster_str_count = sum(1 for img in found_images if img["file"].endswith("monster_str.png"))
-    monster_dex_count = sum(1 for img in found_images if img["file"].endswith("monster_dex.png"))
-    monster_int_count = sum(1 for img in found_images if img["file"].endswith("monster_int.png"))
-    monster_luk_count = sum(1 for img in found_images if img["file"].endswith("monster_luk.png"))
-    monster_cri_count = sum(1 for img in found_images if img["file"].endswith("monster_cri.png"))
-    monster_hp_count = sum(1 for img in found_images if img["file"].endswith("monster_hp.png"))
-    monster_ignore_count = sum(1 for img in found_images if img["file"].endswith("monster_ignore.png"))
-    monster_buff_count = sum(1 for img in found_images if img["file"].endswith("monster_buff.png"))
-
-    condition1 = final_count >= 3
-    condition2 = final_count >= 2
-    condition3_1 = condition2 and monster_atk_count >= 1
-    condition3_2 = condition2 and monster_magic_count >= 1
-    condition3_3 = condition2 and monster_all_count >= 1
-    condition3_4 = condition2 and monster_str_count >= 1
-    condition3_5 = condition2 and monster_dex_count >= 1
-    condition3_6 = condition2 and monster_int_count >= 1
-    condition3_7 = condition2 and monster_luk_count >= 1
-    condition3_8 = condition2 and monster_cri_count >= 1
-    condition3_9 = condition2 and monster_hp_count >= 1
-    condition3_10 = condition2 and monster_ignore_count >= 1
-    condition3_11 = condition2 and monster_buff_count >= 1
-    condition3_12 = condition2 and skill_2_count >= 1
-    condition3 = (
-        (condition3_1 and enable_c3_1) or (condition3_2 and enable_c3_2) or (condition3_3 and enable_c3_3) or
-        (condition3_4 and enable_c3_4) or (condition3_5 and enable_c3_5) or (condition3_6 and enable_c3_6) or
-        (condition3_7 and enable_c3_7) or (condition3_8 and enable_c3_8) or (condition3_9 and enable_c3_9) or
-        (condition3_10 and enable_c3_10) or (condition3_11 and enable_c3_11) or (condition3_12 and enable_c3_12)
-    )
-    condition4 = (monster_atk_count >= 2 or monster_magic_count >= 2) and skill_2_count >= 1
-    condition5 = final_count >= 1 and (monster_atk_count >= 2 or monster_magic_count >= 2)
-    condition6 = final_count >= 1 and skill_2_count >= 1 and (monster_atk_count >= 1 or monster_magic_count >= 1)
-    condition7 = monster_atk_count >= 3 or monster_magic_count >= 3
-    satisfied = condition1 or (condition2 and enable_c2) or (condition3 and enable_c3) or (condition4 and enable_c4) or (condition5 and enable_c5) or (condition6 and enable_c6) or (condition7 and enable_c7)
-    return satisfied, condition1, condition3_1, condition3_2
-
-
-def _run_monster_loop_recovery(stop_event, status_callback, log_callback, condition_flags):
-    """怪怪恢复魔方(一次洗三个)的主循环：找三个 after -> 划定三个 after 框 -> 依次在框内查终止条件 -> 不满足则点 btn_reset3 双空格后继续。"""
-    enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7, c3_sub_flags = condition_flags
-    enable_c3_1, enable_c3_2, enable_c3_3, enable_c3_4, enable_c3_5, enable_c3_6, enable_c3_7, enable_c3_8, enable_c3_9, enable_c3_10, enable_c3_11, enable_c3_12 = c3_sub_flags
+    return format_counts(count_vector(found_images)) or "无"
+
+
+def _run_monster_loop_recovery(stop_event, status_callback, log_callback, conditions):
+    """怪怪恢复魔方(一次洗三个)的主循环：截一次图 -> 找三个 after -> 从同一帧裁出三个 after 框 -> 在框内查终止条件 -> 不满足则点 btn_reset3 双空格后继续。"""
     find_count = 0
     try:
         while not stop_event.is_set():
-            after_matches = find_all_matches("picture/after.png", log_callback=log_callback)
+            # 每轮只截一次图：after 定位与三个框的词条识别共用同一帧
+            round_start = time.perf_counter()
+            frame = Frame.grab(SEARCH_REGION)
+            after_matches = find_all_matches("picture/after.png", region=frame, log_callback=log_callback)
             if len(after_matches) == 0:
                 log_callback("错误，请确定是否已经进入洗恢复魔方的界面（一个before，三个after框）")
                 status_callback("错误，请确定是否已经进入洗恢复魔方的界面")
@@ -287,26 +159,19 @@ def _run_monster_loop_recovery(stop_event, status_callback, log_callback, condit
                 y1 = m["y"]
                 after_boxes.append((x1, y1, x1 + AFTER_BOX_W, y1 + AFTER_BOX_H))
             find_count += 1
-            # 先收集三个框的找图结果和日志串
-            box_result_strs = []
-            box_found_images_list = []
-            for box_idx, box in enumerate(after_boxes):
-                if stop_event.is_set():
-                    status_callback("已手动停止")
-                    return
-                found_images = find_image_in_region(region=box, log_callback=log_callback, image_subdir="three")
-                box_found_images_list.append(found_images)
-                box_result_strs.append(_result_str_from_found_images(found_images))
-            log_callback(f"第{find_count}次，1框：{box_result_strs[0]}；2框：{box_result_strs[1]}；3框：{box_result_strs[2]}")
+            # 三个框从同一帧裁出，词条模板各框分别匹配（可并行）
+            if stop_event.is_set():
+                status_callback("已手动停止")
+                return
+            box_found_images_list = find_images_in_boxes(frame, after_boxes, log_callback=log_callback, image_subdir="three")
+            box_result_strs = [_result_str_from_found_images(found_images) for found_images in box_found_images_list]
+            elapsed_ms = (time.perf_counter() - round_start) * 1000
+            log_callback(f"第{find_count}次，1框：{box_result_strs[0]}；2框：{box_result_strs[1]}；3框：{box_result_strs[2]}（找图{elapsed_ms:.0f}ms）")
             for box_idx, found_images in enumerate(box_found_images_list):
-                satisfied, condition1, condition3_1, condition3_2 = _check_conditions_in_found_images(
-                    found_images, enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7,
-                    enable_c3_1, enable_c3_2, enable_c3_3, enable_c3_4, enable_c3_5, enable_c3_6,
-                    enable_c3_7, enable_c3_8, enable_c3_9, enable_c3_10, enable_c3_11, enable_c3_12,
-                )
+                satisfied, play_wav = conditions.check(count_vector(found_images))
                 if satisfied:
                     log_callback(f"第{find_count}次，第{box_idx + 1}个框满足条件，停止魔方！")
-                    if condition1 or (condition3_1 and enable_c3_1) or (condition3_2 and enable_c3_2):
+                    if play_wav:
                         log_callback("沃日！狗叫！分钱！")
                         wav_path = get_resource_path("sound/wangwang.wav")
                         if os.path.exists(wav_path):
@@ -742,6 +607,16 @@ class MonsterAbilityApp:
         """窗口内焦点时的按键"""
         self.root.bind("<F11>", lambda e: self.start())
         self.root.bind("<F12>", lambda e: self.stop())
+        self.root.bind("<F10>", lambda e: self._dump_find_profile())
+
+    def _dump_find_profile(self):
+        """F10：首次按下开启找图耗时统计，之后每次把统计输出到日志。"""
+        if not profiling_enabled():
+            enable_profiling(True)
+            self._log_append("已开启找图统计，再按 F10 输出到日志")
+            return
+        for line in format_profile().splitlines():
+            self._log_append(line)
 
     def _register_global_hotkeys(self):
         """注册全局热键，在别的窗口按 F11/F12 也生效"""
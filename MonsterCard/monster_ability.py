@@ -1,16 +1,18 @@
 import pyautogui
-import cv2
-import numpy as np
 import winsound
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 import os
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
+import threading
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import Frame, find_all, get_image_center
+from Utils.template_bank import TemplateBank, TemplateBankError
 
 def get_resource_path(relative_path):
     """获取资源文件的绝对路径，兼容PyInstaller打包后的exe"""
@@ -61,6 +63,9 @@ MATCH_THRESHOLD = 0.99
 # 最小匹配距离（像素），用于过滤重复匹配
 MIN_MATCH_DISTANCE = 10
 
+# 恢复魔方三个框并行找图的线程数（OpenCV 匹配时会释放 GIL）；设为 1 则在当前线程依次找
+BOX_MATCH_WORKERS = 3
+
 # 按钮查找区域，与 SEARCH_REGION 一致（全屏找图）
 BTN_RESET_REGION = SEARCH_REGION
 BTN_CONFIRM_REGION = SEARCH_REGION
@@ -68,66 +73,11 @@ BTN_CONFIRM_REGION = SEARCH_REGION
 def find_image_and_click(template_path, region, log_callback=None):
     """在指定区域内查找模板图，找到后点击匹配中心。
     返回 True 表示找到并已点击，False 表示未找到。"""
-    x1, y1, x2, y2 = region
-    left, top = x1, y1
-    width = x2 - x1
-    height = y2 - y1
-
     # 使用get_resource_path获取正确的资源路径（兼容打包）
-    img_path = get_resource_path(template_path)
-    img_path_obj = Path(img_path)
-    
-    if not img_path_obj.exists():
-        return False
-
-    # 使用绝对路径字符串，cv2.imread需要字符串路径
-    img_path_str = str(img_path_obj.resolve())
-    # 尝试使用cv2读取
-    template = cv2.imread(img_path_str, cv2.IMREAD_GRAYSCALE)
-    if template is None:
-        # 如果cv2读取失败，尝试使用PIL读取
-        if HAS_PIL:
-            try:
-                pil_img = Image.open(img_path_str)
-                # 转换为灰度图
-                if pil_img.mode != 'L':
-                    pil_img = pil_img.convert('L')
-                # 转换为numpy数组
-                template = np.array(pil_img)
-            except Exception:
-                return False
-        else:
-            return False
-
-    if template.shape[0] > height or template.shape[1] > width:
-        return False
-
-    # 截取屏幕指定区域（添加异常捕获）
-    try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-    except Exception:
-        return False  # 截图失败，返回False
-    
-    try:
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-    except Exception:
-        return False  # 图像处理失败，返回False
-
-    result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-    if max_val < MATCH_THRESHOLD:
+    center = get_image_center(region, get_resource_path(template_path), MATCH_THRESHOLD)
+    if center is None:
         return False
-
-    # 匹配框左上角在区域内的坐标
-    match_x, match_y = max_loc
-    tw, th = template.shape[1], template.shape[0]
-    # 匹配中心在屏幕上的坐标
-    click_x = left + match_x + tw // 2
-    click_y = top + match_y + th // 2
-
-    pyautogui.click(click_x, click_y)
+    pyautogui.click(center[0], center[1])
     return True
 
 
@@ -136,60 +86,7 @@ def check_image_exists(template_path, region=None, log_callback=None):
     返回 True 表示找到，False 表示未找到"""
     if region is None:
         region = SEARCH_REGION
-    
-    x1, y1, x2, y2 = region
-    left, top = x1, y1
-    width = x2 - x1
-    height = y2 - y1
-
-    # 使用get_resource_path获取正确的资源路径（兼容打包）
-    img_path = get_resource_path(template_path)
-    img_path_obj = Path(img_path)
-    
-    if not img_path_obj.exists():
-        return False
-
-    # 使用绝对路径字符串，cv2.imread需要字符串路径
-    img_path_str = str(img_path_obj.resolve())
-    # 尝试使用cv2读取
-    template = cv2.imread(img_path_str, cv2.IMREAD_GRAYSCALE)
-    if template is None:
-        # 如果cv2读取失败，尝试使用PIL读取
-        if HAS_PIL:
-            try:
-                pil_img = Image.open(img_path_str)
-                # 转换为灰度图
-                if pil_img.mode != 'L':
-                    pil_img = pil_img.convert('L')
-                # 转换为numpy数组
-                template = np.array(pil_img)
-            except Exception:
-                return False
-        else:
-            return False
-
-    if template.shape[0] > height or template.shape[1] > width:
-        return False
-
-    # 截取屏幕指定区域（添加异常捕获）
-    try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-    except Exception:
-        return False  # 截图失败，返回False
-    
-    try:
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-    except Exception:
-        return False  # 图像处理失败，返回False
-
-    result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-    if max_val < MATCH_THRESHOLD:
-        return False
-
-    return True
+    return get_image_center(region, get_resource_path(template_path), MATCH_THRESHOLD) is not None
 
 
 def find_all_matches(template_path, region=None, log_callback=None):
@@ -197,175 +94,103 @@ def find_all_matches(template_path, region=None, log_callback=None):
     返回列表，每项为 dict: {'x': 屏幕x, 'y': 屏幕y, 'w': 宽, 'h': 高}（匹配框左上角及模板宽高）"""
     if region is None:
         region = SEARCH_REGION
-    x1, y1, x2, y2 = region
-    left, top = x1, y1
-    width = x2 - x1
-    height = y2 - y1
-
-    img_path = get_resource_path(template_path)
-    img_path_obj = Path(img_path)
-    if not img_path_obj.exists():
-        return []
-    img_path_str = str(img_path_obj.resolve())
-    template = cv2.imread(img_path_str, cv2.IMREAD_GRAYSCALE)
-    if template is None and HAS_PIL:
-        try:
-            pil_img = Image.open(img_path_str)
-            if pil_img.mode != 'L':
-                pil_img = pil_img.convert('L')
-            template = np.array(pil_img)
-        except Exception:
-            return []
-    if template is None:
-        return []
-    tw, th = template.shape[1], template.shape[0]
-    if th > height or tw > width:
-        return []
-
-    try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-    except Exception:
-        return []
-
-    result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-    locations = np.where(result >= MATCH_THRESHOLD)
-    matches = list(zip(*locations[::-1]))
-
-    out = []
-    for match_x, match_y in matches:
-        actual_x = left + match_x
-        actual_y = top + match_y
-        is_duplicate = any(
-            abs(actual_x - m['x']) < MIN_MATCH_DISTANCE and abs(actual_y - m['y']) < MIN_MATCH_DISTANCE
-            for m in out
-        )
-        if not is_duplicate:
-            out.append({'x': actual_x, 'y': actual_y, 'w': tw, 'h': th})
-    return out
+    matches = find_all(region, get_resource_path(template_path), MATCH_THRESHOLD, MIN_MATCH_DISTANCE)
+    # 与原先逐行扫描的结果顺序一致：先上后下、先左后右
+    matches.sort(key=lambda m: (m['topleft'][1], m['topleft'][0]))
+    return [
+        {'x': m['topleft'][0], 'y': m['topleft'][1], 'w': m['size'][0], 'h': m['size'][1]}
+        for m in matches
+    ]
+
+
+_template_banks = {}
+_template_banks_lock = threading.Lock()
+
+
+def load_template_bank(image_subdir):
+    """加载 picture/{image_subdir}/ 下的全部词条模板（首次调用时读取，之后复用同一只读模板库）。
+    同时按该图库的搜索区域校验模板尺寸："one" 为 SEARCH_REGION，"three" 为单个 after 框。
+    模板缺失、无法读取或过大时抛出 TemplateBankError（不缓存失败结果，下次开始时会重新加载）"""
+    bank = _template_banks.get(image_subdir)
+    if bank is not None:
+        return bank
+    with _template_banks_lock:
+        bank = _template_banks.get(image_subdir)
+        if bank is None:
+            if image_subdir == "three":
+                max_size = (AFTER_BOX_W, AFTER_BOX_H)
+            else:
+                max_size = (SEARCH_REGION[2] - SEARCH_REGION[0], SEARCH_REGION[3] - SEARCH_REGION[1])
+            paths = {name: get_resource_path(f"picture/{image_subdir}/{name}") for name in IMAGE_FILE_NAMES}
+            bank = _template_banks[image_subdir] = TemplateBank(paths, max_size=max_size)
+    return bank
 
 
 def find_image_in_region(region=None, log_callback=None, match_threshold=None, image_subdir="one"):
-    """在指定区域内查找图片，使用OpenCV进行精确匹配
-    region: (x1,y1,x2,y2)，None 则使用 SEARCH_REGION
+    """在指定区域内查找图片（整轮只截一次图，模板取自 load_template_bank 预加载的模板库）
+    region: (x1,y1,x2,y2) 或已截好的 Frame，None 则使用 SEARCH_REGION
     match_threshold: 匹配阈值，None 则使用 MATCH_THRESHOLD
     image_subdir: 图库子目录，"one"=怪怪魔方(picture/one/)，"three"=怪怪恢复魔方(picture/three/)
     返回找到的图片列表，每项 file 为 picture/{image_subdir}/{filename}"""
     if region is None:
         region = SEARCH_REGION
-    # 计算区域参数 (left, top, width, height)
-    x1, y1, x2, y2 = region
-    left = int(x1)
-    top = int(y1)
-    width = int(x2 - x1)
-    height = int(y2 - y1)
     if match_threshold is None:
         match_threshold = MATCH_THRESHOLD
-    use_threshold = match_threshold
-    
+
     # 截取屏幕指定区域（添加异常捕获）
     try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
+        frame = region if isinstance(region, Frame) else Frame.grab(region)
     except Exception:
         return []  # 截图失败，返回空列表
-    
-    try:
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-    except Exception:
-        return []  # 图像处理失败，返回空列表
-    
+
+    bank = load_template_bank(image_subdir)
     found_images = []  # 存储找到的图片信息
 
     # 遍历所有图片文件（路径为 picture/{image_subdir}/{name}）
     for name in IMAGE_FILE_NAMES:
         img_file = f"picture/{image_subdir}/{name}"
-        # 使用get_resource_path获取正确的资源路径（兼容打包）
-        img_path = get_resource_path(img_file)
-        img_path_obj = Path(img_path)
-        
-        if not img_path_obj.exists():
-            continue
-        
-        try:
-            # 读取模板图片（使用字符串路径，cv2.imread需要字符串）
-            img_path_str = str(img_path_obj.resolve())
-        
-            # 尝试使用cv2读取
-            template = cv2.imread(img_path_str, cv2.IMREAD_GRAYSCALE)
-            if template is None:
-                # 如果cv2读取失败，尝试使用PIL读取
-                if HAS_PIL:
-                    try:
-                        pil_img = Image.open(img_path_str)
-                        # 转换为灰度图
-                        if pil_img.mode != 'L':
-                            pil_img = pil_img.convert('L')
-                        # 转换为numpy数组
-                        template = np.array(pil_img)
-                    except Exception:
-                        continue
-                else:
-                    continue
-            
-            # 检查模板是否大于搜索区域
-            if template.shape[0] > height or template.shape[1] > width:
-                continue
-            
-            # 使用模板匹配
-            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            # 找到所有超过阈值的匹配位置
-            locations = np.where(result >= use_threshold)
-            matches = list(zip(*locations[::-1]))  # 转换为(x, y)坐标列表
-            
-            if len(matches) == 0:
-                continue
-            
-            # 过滤掉距离太近的重复匹配
-            filtered_matches = []
-            for match_x, match_y in matches:
-                # 计算实际屏幕坐标
-                actual_x = left + match_x
-                actual_y = top + match_y
-                match_score = result[match_y, match_x]
-                
-                # 检查是否与已有匹配距离太近
-                is_duplicate = False
-                for i, existing in enumerate(filtered_matches):
-                    distance = np.sqrt((actual_x - existing['x'])**2 + (actual_y - existing['y'])**2)
-                    if distance < MIN_MATCH_DISTANCE:
-                        # 如果新匹配分数更高，替换旧的
-                        if match_score > existing['score']:
-                            filtered_matches[i] = {
-                                'file': img_file,
-                                'x': actual_x,
-                                'y': actual_y,
-                                'score': match_score
-                            }
-                        is_duplicate = True
-                        break
-                
-                if not is_duplicate:
-                    filtered_matches.append({
-                        'file': img_file,
-                        'x': int(actual_x),
-                        'y': int(actual_y),
-                        'score': match_score
-                    })
-            
-            # 添加到结果列表
-            for match in filtered_matches:
-                found_images.append(match)
-            
-        except Exception:
-            continue
+        # 非极大值抑制：距离过近的重复匹配只保留分数最高的一个
+        for m in bank.find_all(frame, name, match_threshold, MIN_MATCH_DISTANCE):
+            found_images.append({
+                'file': img_file,
+                'x': m['topleft'][0],
+                'y': m['topleft'][1],
+                'score': m['score']
+            })
 
     return found_images
 
 
+_box_pool = None
+_box_pool_lock = threading.Lock()
+
+
+def _get_box_pool():
+    """三个框共用的线程池，首次使用时创建，之后每轮复用。"""
+    global _box_pool
+    if _box_pool is None:
+        with _box_pool_lock:
+            if _box_pool is None:
+                _box_pool = ThreadPoolExecutor(max_workers=BOX_MATCH_WORKERS, thread_name_prefix="monster-box")
+    return _box_pool
+
+
+def find_images_in_boxes(frame, boxes, log_callback=None, match_threshold=None, image_subdir="three"):
+    """在同一帧内裁出各框（numpy 视图，不复制像素），分别查找词条。
+    BOX_MATCH_WORKERS > 1 时各框在线程池中并行匹配。
+    返回与 boxes 一一对应的 found_images 列表（格式同 find_image_in_region）"""
+    frame.gray  # 先在当前线程转好整帧灰度，各框直接切片复用
+    crops = [frame.crop(box) for box in boxes]
+
+    def job(crop):
+        return find_image_in_region(region=crop, log_callback=log_callback,
+                                    match_threshold=match_threshold, image_subdir=image_subdir)
+
+    if BOX_MATCH_WORKERS > 1 and len(crops) > 1:
+        return list(_get_box_pool().map(job, crops))
+    return [job(crop) for crop in crops]
+
+
 def _press_space():
     """按一次空格（优先 keyboard，否则 pyautogui）。"""
     try:
@@ -1,6 +1,4 @@
-import pyautogui
-import cv2
-import numpy as np
+import sys
 import winsound
 import time
 import threading
@@ -9,6 +7,12 @@ from typing import Callable, Literal, Optional
 
 from monster_ability import check_image_exists
 
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import Frame, find_image_and_click, get_image_topleft_with_score, match_many
+
 BagStepResult = Literal["continue", "bag_full", "no_more"]
 
 # 找图顺序与 IMAGE_FILES 一致，用于开包模式简短日志
@@ -62,30 +66,10 @@ def find_and_click_in_region(relative_path: str) -> bool:
     """在 SEARCH_REGION 内找图并点击模板中心。未找到返回 False。"""
     rel = relative_path.replace("\\", "/")
     img_path = BASE_DIR / rel
-    x1, y1, x2, y2 = SEARCH_REGION
-    left, top = x1, y1
-    width, height = x2 - x1, y2 - y1
-
     if not img_path.is_file():
         return False
     try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        template = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            return False
-        if template.shape[0] > height or template.shape[1] > width:
-            return False
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        _min_val, max_val, _min_loc, max_loc = cv2.minMaxLoc(result)
-        if max_val < MATCH_THRESHOLD:
-            return False
-        tw, th = template.shape[1], template.shape[0]
-        cx = left + max_loc[0] + tw // 2
-        cy = top + max_loc[1] + th // 2
-        pyautogui.click(cx, cy)
-        return True
+        return find_image_and_click(SEARCH_REGION, img_path, MATCH_THRESHOLD)
     except Exception:
         return False
 
@@ -93,98 +77,52 @@ def find_and_click_in_region(relative_path: str) -> bool:
 def find_first_match_key() -> Optional[str]:
     """在 SEARCH_REGION 内按 IMAGE_FILES 顺序找第一张匹配的图，不输出日志。
     返回 'lcd'|'kl'|'sl'|'ark'|'bag_full' 或 None。"""
-    x1, y1, x2, y2 = SEARCH_REGION
-    left, top = x1, y1
-    width, height = x2 - x1, y2 - y1
-    try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-    except Exception:
-        return None
-
+    results = match_many(SEARCH_REGION, [BASE_DIR / f for f in IMAGE_FILES], MATCH_THRESHOLD)
     for img_file in IMAGE_FILES:
-        img_path = BASE_DIR / img_file
-        if not img_path.exists():
-            continue
-        try:
-            template = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-            if template is None:
-                continue
-            if template.shape[0] > height or template.shape[1] > width:
-                continue
-            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-            _min_val, max_val, _min_loc, _max_loc = cv2.minMaxLoc(result)
-            if max_val >= MATCH_THRESHOLD:
-                return _MATCH_KEY_BY_FILE.get(img_file)
-        except Exception:
-            continue
+        if results[BASE_DIR / img_file]["center"] is not None:
+            return _MATCH_KEY_BY_FILE.get(img_file)
     return None
 
 
+def _find_with_log(region, img_file) -> bool:
+    """在 region（搜索区域或已截好的 Frame）内查找 img_file，输出匹配分数与位置日志。"""
+    img_path = BASE_DIR / img_file
+    if not img_path.exists():
+        _bag_log(f"警告: 图片文件不存在 - {img_path}")
+        return False
+
+    _bag_log(f"正在查找: {img_file}")
+
+    topleft, max_val = get_image_topleft_with_score(region, img_path, MATCH_THRESHOLD)
+    if max_val is None:
+        _bag_log(f"✗ 无法读取图片或模板大于搜索区域: {img_file}")
+        return False
+
+    _bag_log(f"  匹配分数: {max_val:.4f} (阈值: {MATCH_THRESHOLD})")
+
+    # 检查是否超过阈值
+    if topleft is not None:
+        _bag_log(f"✓ 找到图片: {img_file}")
+        _bag_log(f"  位置: ({topleft[0]}, {topleft[1]})")
+        _bag_log(f"  匹配分数: {max_val:.4f}")
+        return True
+    _bag_log(f"✗ 未找到: {img_file} (匹配分数 {max_val:.4f} < 阈值 {MATCH_THRESHOLD})")
+    return False
+
+
 def find_image_in_region():
-    """在指定区域内查找图片，使用OpenCV进行精确匹配
+    """在指定区域内查找图片（找图逻辑见 Utils.find_image）
     返回是否找到图片"""
-    # 计算区域参数 (left, top, width, height)
     x1, y1, x2, y2 = SEARCH_REGION
-    left = x1
-    top = y1
-    width = x2 - x1
-    height = y2 - y1
-    
-    _bag_log(f"搜索区域: ({left}, {top}, {width}, {height})")
-    
+    _bag_log(f"搜索区域: ({x1}, {y1}, {x2 - x1}, {y2 - y1})")
+
     # 截取屏幕指定区域（只需要截取一次）
-    screenshot = pyautogui.screenshot(region=(left, top, width, height))
-    screen_array = np.array(screenshot)
-    screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-    
+    frame = Frame.grab(SEARCH_REGION)
+
     # 遍历所有图片文件
     for img_file in IMAGE_FILES:
-        img_path = BASE_DIR / img_file
-        
-        if not img_path.exists():
-            _bag_log(f"警告: 图片文件不存在 - {img_path}")
-            continue
-        
-        _bag_log(f"正在查找: {img_file}")
-        
-        try:
-            # 读取模板图片
-            template = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-            if template is None:
-                _bag_log(f"✗ 无法读取图片: {img_file}")
-                continue
-            
-            # 检查模板是否大于搜索区域
-            if template.shape[0] > height or template.shape[1] > width:
-                _bag_log(f"✗ 模板图片尺寸({template.shape[1]}x{template.shape[0]})大于搜索区域({width}x{height})")
-                continue
-            
-            # 使用模板匹配
-            result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            _bag_log(f"  匹配分数: {max_val:.4f} (阈值: {MATCH_THRESHOLD})")
-            
-            # 检查是否超过阈值
-            if max_val >= MATCH_THRESHOLD:
-                # 计算实际屏幕坐标
-                actual_x = left + max_loc[0]
-                actual_y = top + max_loc[1]
-                _bag_log(f"✓ 找到图片: {img_file}")
-                _bag_log(f"  位置: ({actual_x}, {actual_y})")
-                _bag_log(f"  匹配分数: {max_val:.4f}")
-                return True
-            else:
-                _bag_log(f"✗ 未找到: {img_file} (匹配分数 {max_val:.4f} < 阈值 {MATCH_THRESHOLD})")
-                
-        except Exception as e:
-            _bag_log(f"✗ 查找 {img_file} 时出错: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
-    
+        if _find_with_log(frame, img_file):
+            return True
     return False
 
 
@@ -205,60 +143,7 @@ def perform_click_sequence() -> BagStepResult:
 
 def find_bag_full():
     """查找bag_full.png图片"""
-    x1, y1, x2, y2 = SEARCH_REGION
-    left = x1
-    top = y1
-    width = x2 - x1
-    height = y2 - y1
-    
-    img_path = BASE_DIR / 'picture/bag_full.png'
-    
-    if not img_path.exists():
-        _bag_log(f"警告: 图片文件不存在 - {img_path}")
-        return False
-    
-    _bag_log(f"正在查找: picture/bag_full.png")
-    
-    try:
-        # 截取屏幕指定区域
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        
-        # 读取模板图片
-        template = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            _bag_log(f"✗ 无法读取图片: picture/bag_full.png")
-            return False
-        
-        # 检查模板是否大于搜索区域
-        if template.shape[0] > height or template.shape[1] > width:
-            _bag_log(f"✗ 模板图片尺寸({template.shape[1]}x{template.shape[0]})大于搜索区域({width}x{height})")
-            return False
-        
-        # 使用模板匹配
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-        
-        _bag_log(f"  匹配分数: {max_val:.4f} (阈值: {MATCH_THRESHOLD})")
-        
-        # 检查是否超过阈值
-        if max_val >= MATCH_THRESHOLD:
-            actual_x = left + max_loc[0]
-            actual_y = top + max_loc[1]
-            _bag_log(f"✓ 找到图片: picture/bag_full.png")
-            _bag_log(f"  位置: ({actual_x}, {actual_y})")
-            _bag_log(f"  匹配分数: {max_val:.4f}")
-            return True
-        else:
-            _bag_log(f"✗ 未找到: picture/bag_full.png (匹配分数 {max_val:.4f} < 阈值 {MATCH_THRESHOLD})")
-            return False
-            
-    except Exception as e:
-        _bag_log(f"✗ 查找 picture/bag_full.png 时出错: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    return _find_with_log(SEARCH_REGION, 'picture/bag_full.png')
 
 
 def perform_use_sequence() -> BagStepResult:
@@ -0,0 +1,98 @@
+"""
+怪怪魔方终止条件的规则表与判定：每轮把找图结果汇总成一个词条计数向量，
+再用一次向量化比较判断所有已启用的条件。普通模式与恢复魔方（每个框）共用。
+新增终止条件只需在 RULES 里加一行。
+"""
+from pathlib import Path
+
+import numpy as np
+
+# 词条（对应 picture/one|three/{词条}.png，顺序同 monster_ability.IMAGE_FILE_NAMES）及日志显示名
+STATS = (
+    "final", "monster_atk", "monster_magic", "skill_2", "monster_all", "monster_str", "monster_dex",
+    "monster_int", "monster_luk", "monster_cri", "monster_hp", "monster_ignore", "monster_buff",
+)
+STAT_LABELS = ("终", "攻", "魔", "被", "全", "力", "敏", "智", "运", "爆", "血", "无视", "buff")
+STAT_INDEX = {stat: i for i, stat in enumerate(STATS)}
+
+# 终止条件：名称 -> 若干子句，子句之间为或逻辑；子句为 {词条: 最少次数}，词条之间为与逻辑
+RULES = {
+    "c1": [{"final": 3}],  # 三终（必选）
+    "c2": [{"final": 2}],  # 双终
+    "c3_1": [{"final": 2, "monster_atk": 1}],  # 双终攻
+    "c3_2": [{"final": 2, "monster_magic": 1}],  # 双终魔
+    "c3_3": [{"final": 2, "monster_all": 1}],  # 双终全
+    "c3_4": [{"final": 2, "monster_str": 1}],  # 双终力
+    "c3_5": [{"final": 2, "monster_dex": 1}],  # 双终敏
+    "c3_6": [{"final": 2, "monster_int": 1}],  # 双终智
+    "c3_7": [{"final": 2, "monster_luk": 1}],  # 双终运
+    "c3_8": [{"final": 2, "monster_cri": 1}],  # 双终爆
+    "c3_9": [{"final": 2, "monster_hp": 1}],  # 双终血
+    "c3_10": [{"final": 2, "monster_ignore": 1}],  # 双终无视
+    "c3_11": [{"final": 2, "monster_buff": 1}],  # 双终buff
+    "c3_12": [{"final": 2, "skill_2": 1}],  # 双终被
+    "c4": [{"monster_atk": 2, "skill_2": 1}, {"monster_magic": 2, "skill_2": 1}],  # 双攻被、双魔被
+    "c5": [{"final": 1, "monster_atk": 2}, {"final": 1, "monster_magic": 2}],  # 双攻终、双魔终
+    "c6": [{"final": 1, "skill_2": 1, "monster_atk": 1}, {"final": 1, "skill_2": 1, "monster_magic": 1}],  # 终攻被、终魔被
+    "c7": [{"monster_atk": 3}, {"monster_magic": 3}],  # 三攻、三魔
+}
+
+# 满足后播放狗叫音效（而不是普通 beep）的条件；与原逻辑一致，c3_1/c3_2 只看子条件是否勾选
+JACKPOT_RULES = ("c1", "c3_1", "c3_2")
+
+RULE_NAMES = tuple(RULES)
+_RULE_INDEX = {name: i for i, name in enumerate(RULE_NAMES)}
+
+# 编译后的子句矩阵：_CLAUSES[j, s] 为第 j 个子句对词条 s 的最少次数，_CLAUSE_RULE[j] 为其所属条件下标
+_CLAUSES = np.array([[clause.get(stat, 0) for stat in STATS] for clauses in RULES.values() for clause in clauses],
+                    dtype=np.int32)
+_CLAUSE_RULE = np.array([i for i, clauses in enumerate(RULES.values()) for _ in clauses], dtype=np.intp)
+
+
+def count_vector(found_images):
+    """把 find_image_in_region 的结果汇总成词条计数向量（长度同 STATS），一次遍历完成。"""
+    idx = [STAT_INDEX[stem] for stem in (Path(img["file"]).stem for img in found_images) if stem in STAT_INDEX]
+    return np.bincount(np.asarray(idx, dtype=np.intp), minlength=len(STATS))
+
+
+def format_counts(counts):
+    """计数向量的日志串，如 '1终、2攻'；全为 0 时返回空串。"""
+    return "、".join(f"{n}{label}" for n, label in zip(counts.tolist(), STAT_LABELS) if n > 0)
+
+
+def evaluate_rules(counts):
+    """对计数向量判定全部条件（不区分是否启用），返回长度同 RULE_NAMES 的布尔数组。"""
+    clause_ok = np.all(counts >= _CLAUSES, axis=1)
+    return np.bincount(_CLAUSE_RULE, weights=clause_ok, minlength=len(RULE_NAMES)) > 0
+
+
+def _mask(names):
+    mask = np.zeros(len(RULE_NAMES), dtype=bool)
+    mask[[_RULE_INDEX[n] for n in names]] = True
+    return mask
+
+
+class MonsterConditions:
+    """
+    按界面勾选编译好的终止条件，开始时编译一次，之后每轮 check(counts)。
+    condition_flags: (enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7, c3_sub_flags)，
+    c3_sub_flags 为条件3 的 12 个子条件；条件1 始终启用，子条件需同时勾选条件3 才作为终止条件。
+    """
+
+    def __init__(self, condition_flags):
+        enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7, c3_sub_flags = condition_flags
+        enabled = ["c1"]
+        for name, flag in (("c2", enable_c2), ("c4", enable_c4), ("c5", enable_c5), ("c6", enable_c6), ("c7", enable_c7)):
+            if flag:
+                enabled.append(name)
+        sub_enabled = [f"c3_{i + 1}" for i, flag in enumerate(c3_sub_flags) if flag]
+        if enable_c3:
+            enabled.extend(sub_enabled)
+        self.enabled = tuple(enabled)
+        self.stop_mask = _mask(enabled)
+        self.jackpot_mask = _mask([n for n in JACKPOT_RULES if n == "c1" or n in sub_enabled])
+
+    def check(self, counts):
+        """返回 (是否满足任一已启用条件, 是否播放狗叫音效)。"""
+        met = evaluate_rules(counts)
+        return bool((met & self.stop_mask).any()), bool((met & self.jackpot_mask).any())
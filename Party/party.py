@@ -23,6 +23,12 @@ import pyautogui
 from PIL import Image, ImageTk
 
 from Utils.find_image import _find_image_center_with_score
+from Utils.frame import Frame
+from Utils.frame_gate import FrameGate
+from Utils.poll_scheduler import AdaptivePoller
+
+from scene_classifier import SceneClassifier, SceneResult
+from scene_transitions import TRANSITIONS_FILE_NAME, SceneTransitions
 
 try:
     import keyboard as kb_lib
@@ -76,6 +82,30 @@ DETECT_TASKS: List[str] = [
     "拼图区域",
 ]
 
+# 挂机 tick 间隔（秒）：动作之后快速轮询，画面有变化时为原先的 0.5 秒，画面不变时逐步退避到上限
+BOT_POLL_FAST = 0.2
+BOT_POLL_BASE = 0.5
+BOT_POLL_SLOW = 2.0
+
+# 挂机每个 tick 需要识别的全部场景（与 _bot_tick_scene_chain 的判断顺序一致，光谱地图最后）
+BOT_SCENE_NAMES: Tuple[str, ...] = (
+    "傻福捕鱼",
+    "傻福捕鱼退场",
+    "做菜退场2",
+    "光谱退场2",
+    "做菜退场",
+    "光谱退场",
+    "厨房区域",
+    "星图区域",
+    "拼图区域",
+    "游戏选人界面",
+    "做菜地图",
+    "收藏地图",
+    "收藏村庄",
+    "星图退场区域",
+    "光谱地图",
+)
+
 
 def _clamp(a: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, a))
@@ -175,6 +205,9 @@ class PointData:
 
 
 class PartyApp:
+    # 预测扫描时无论转移模型如何都要匹配的场景（子类可覆盖）
+    ALWAYS_CHECK_SCENES: Tuple[str, ...] = ()
+
     def __init__(
         self,
         master: Optional[Any] = None,
@@ -193,8 +226,15 @@ class PartyApp:
 
         self.picture_dir = self.base_dir / "picture"
         self.picture_dir.mkdir(parents=True, exist_ok=True)
+        self.scene_classifier = SceneClassifier(self.picture_dir, BOT_SCENE_NAMES)
         # 配置与日志也放到可写目录，便于 exe 持久化
         self.ini_file = self.base_dir / "settings.ini"
+        self.scene_transitions = SceneTransitions.load(self.base_dir / TRANSITIONS_FILE_NAME)
+        self.frame_gate = FrameGate()
+        self.bot_poller = AdaptivePoller(BOT_POLL_FAST, BOT_POLL_BASE, BOT_POLL_SLOW)
+        self._last_scene_result: Optional[SceneResult] = None
+        self._tick_reused = False
+        self._tick_acted = False
 
         self.cp = configparser.ConfigParser()
         if self.ini_file.is_file():
@@ -500,8 +540,8 @@ class PartyApp:
         self.auto_save_all()
         self.status_var.set(f"状态：已设置 {titles[which]}：{k}")
 
-    def smart_sleep(self, ms: int) -> bool:
-        if ms >= 1000:
+    def smart_sleep(self, ms: int, log: bool = True) -> bool:
+        if log and ms >= 1000:
             self._log_line(f"[等待] 等待 {ms / 1000:.1f} 秒")
         end = time.monotonic() + ms / 1000.0
         while time.monotonic() < end:
@@ -875,22 +915,84 @@ class PartyApp:
         return False
 
     def _bot_worker(self) -> None:
+        self.scene_transitions.start_session()
+        self.frame_gate.reset()
+        self._last_scene_result = None
+        poller = self.bot_poller
+        poller.reset()
         time.sleep(0.5)
         while self.is_monitoring:
+            self._tick_reused = False
+            self._tick_acted = False
             try:
                 self._bot_tick_once()
             except Exception as e:
                 self.status_var.set(f"⚠️ 监控异常({e})，即将重试...")
-            if not self.smart_sleep(500):
+            if self._tick_acted:
+                poller.kick()
+            if not self.smart_sleep(int(poller.next_interval(changed=not self._tick_reused) * 1000), log=False):
                 break
-
-    def _bot_tick_once(self) -> None:
+        # 挂机结束（停止 / 关闭窗口）时由工作线程自己释放线程池，避免与进行中的 tick 竞争；下次开始时重新创建
+        self.scene_classifier.shutdown()
+        self.scene_transitions.save()
+        self._log_line(f"[场景预测] {self.scene_transitions.format_stats()}")
+        self._log_line(f"[画面门控] {self.frame_gate.format_stats()}")
+        self._log_line(f"[轮询] {poller.format_stats()}")
+
+    def _classify_scene(self) -> SceneResult:
+        """
+        截一次图识别当前场景：画面与上次完整识别时相比没有变化则直接复用上次结果；
+        否则先只匹配转移模型预测的后继场景，未命中再在同一帧上补全完整扫描，识别结果同时计入转移模型。
+        """
+        try:
+            frame = Frame.grab(SEARCH_RECT)
+        except Exception:
+            frame = None
+        last = self._last_scene_result
+        if frame is not None and last is not None and not self.frame_gate.changed(frame):
+            self._tick_reused = True
+            return last
+        model = self.scene_transitions
+        candidates = model.candidates(BOT_SCENE_NAMES, self.ALWAYS_CHECK_SCENES)
+        result = self.scene_classifier.classify_predicted(
+            frame if frame is not None else SEARCH_RECT, tolerance_to_match_threshold(self.tolerance), candidates
+        )
+        if candidates is not None:
+            model.note_scan(result.predicted)
+        model.observe(result.scene)
+        if frame is not None:
+            self.frame_gate.accept(frame)
+        self._last_scene_result = result
+        return result
+
+    def _scene_finder(self, result: SceneResult) -> Callable[[str], bool]:
+        """
+        按本 tick 的识别结果回答 find_scene：分支顺序与 BOT_SCENE_NAMES 一致，只有优先级最高的命中场景为真
+        （预测扫描未匹配的场景视为未命中）；一旦命中某场景并开始执行动作，分支内的再次判断改为实时截图，
+        且下一 tick 不再复用本次结果。
+        """
         r = SEARCH_RECT
         tol = self.tolerance
+        fresh = True
 
         def find_scene(name: str) -> bool:
-            return match_template_in_rect(r, self._template_path(name), tol) is not None
+            nonlocal fresh
+            if fresh and (name in result.scores or result.predicted):
+                hit = name == result.scene
+            else:
+                hit = match_template_in_rect(r, self._template_path(name), tol) is not None
+            if hit:
+                fresh = False
+                self._tick_acted = True
+                self.frame_gate.invalidate()
+            return hit
 
+        return find_scene
+
+    def _bot_tick_once(self) -> None:
+        # 本 tick 只截一次图，并行给场景打分，按优先级最高的命中场景分派
+        result = self._classify_scene()
+        find_scene = self._scene_finder(result)
         if self._bot_tick_scene_chain(find_scene):
             return
         if find_scene("光谱地图"):
@@ -9,12 +9,14 @@
 """
 from __future__ import annotations
 
-from party import PartyApp, SEARCH_RECT, match_template_in_rect
+from party import PartyApp
 
 
 class PartyOnceApp(PartyApp):
     """光谱地图 / 光谱退场优先检测；命中后直接 stop_monitoring；无日志文件。"""
 
+    ALWAYS_CHECK_SCENES = ("光谱退场", "光谱地图")
+
     def _log_line(self, msg: str) -> None:
         pass
 
@@ -22,19 +24,15 @@ class PartyOnceApp(PartyApp):
         self.messagebox.showinfo("提示", "本模式不写入日志文件。")
 
     def _bot_tick_once(self) -> None:
-        r = SEARCH_RECT
-        tol = self.tolerance
-
-        def find_scene(name: str) -> bool:
-            return match_template_in_rect(r, self._template_path(name), tol) is not None
-
-        if find_scene("光谱地图"):
+        # 与 PartyApp 相同只截一次图并行识别；光谱地图 / 光谱退场每次都匹配，只要命中即停止，优先于分支顺序
+        result = self._classify_scene()
+        if "光谱地图" in result.hits:
             self.stop_monitoring("状态：🌈 识别光谱地图，已停止任务")
             return
-        if find_scene("光谱退场"):
+        if "光谱退场" in result.hits:
             self.stop_monitoring("状态：🚨 识别光谱退场，已停止任务")
             return
-        if self._bot_tick_scene_chain(find_scene):
+        if self._bot_tick_scene_chain(self._scene_finder(result)):
             return
         self.status_var.set("状态：🔍 监控中 (0,0)–(1366,768)...")
 
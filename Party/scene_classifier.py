@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+挂机场景识别：每个 tick 只截一次图，在线程池中并行对全部场景模板打分，
+返回优先级最高（在场景列表中最靠前）的命中场景及其匹配分数。
+OpenCV 匹配时会释放 GIL，tick 耗时约为一次截图 + 最慢的一个模板匹配。
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from Utils.find_image import load_template, match_template
+from Utils.frame import Frame
+
+# 并行打分的线程数；设为 1 则在当前线程依次匹配
+SCENE_MATCH_WORKERS = 4
+
+Rect = Tuple[int, int, int, int]
+
+
+@dataclass
+class SceneResult:
+    """
+    一次场景识别的结果。scene 为优先级最高的命中场景（无命中为 None），score 为其匹配分数；
+    predicted 为 True 表示结果来自只匹配部分场景的预测扫描（见 classify_predicted），
+    排在 scene 之后的场景可能未匹配，不在 scores 中。
+    """
+
+    scene: Optional[str] = None
+    score: Optional[float] = None
+    scores: Dict[str, Optional[float]] = field(default_factory=dict)
+    hits: Tuple[str, ...] = ()
+    elapsed_ms: float = 0.0
+    frame: Optional[Frame] = None
+    predicted: bool = False
+
+    def __bool__(self) -> bool:
+        return self.scene is not None
+
+
+class SceneClassifier:
+    """
+    按优先级排列的一组场景模板（picture_dir/{场景名}.png）。
+    模板每次按路径取自 Utils.find_image 的模板缓存，运行中替换图片后下一 tick 即生效；
+    模板缺失的场景视为未命中，分数为 None。
+    """
+
+    def __init__(self, picture_dir: Path, names: Iterable[str], workers: int = SCENE_MATCH_WORKERS) -> None:
+        self.picture_dir = Path(picture_dir)
+        self.names: Tuple[str, ...] = tuple(names)
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def template_path(self, name: str) -> Path:
+        return self.picture_dir / f"{name}.png"
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """首次使用时创建线程池，之后每个 tick 复用。"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="party-scene")
+        return self._pool
+
+    def shutdown(self) -> None:
+        """释放线程池（挂机结束时调用）；之后再 classify 会重新创建。"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def classify(
+        self,
+        region: Union[Rect, Frame],
+        threshold: float,
+        names: Optional[Iterable[str]] = None,
+    ) -> SceneResult:
+        """
+        对 region（区域元组或已截好的 Frame）截一次图，并行匹配 names（默认全部场景）。
+        names 可只给部分场景，结果中的优先级仍按构造时的场景顺序。
+        截图失败时返回空结果。
+        """
+        t0 = time.perf_counter()
+        if names is None:
+            order = self.names
+        else:
+            wanted = set(names)
+            order = tuple(n for n in self.names if n in wanted)
+        try:
+            frame = region if isinstance(region, Frame) else Frame.grab(region)
+            frame.gray  # 先在当前线程转好灰度，各线程直接复用
+        except Exception:
+            return SceneResult(scores={n: None for n in order}, elapsed_ms=(time.perf_counter() - t0) * 1000)
+
+        def job(name: str) -> Tuple[Optional[Tuple[int, int]], Optional[float]]:
+            path = self.template_path(name)
+            template = load_template(path)
+            if template is None:
+                return None, None
+            _, center, score = match_template(frame, template, threshold, key=path)
+            return center, score
+
+        if self.workers > 1 and len(order) > 1:
+            results = list(self._get_pool().map(job, order))
+        else:
+            results = [job(n) for n in order]
+
+        scores = {n: score for n, (_, score) in zip(order, results)}
+        hits = tuple(n for n, (center, _) in zip(order, results) if center is not None)
+        scene = hits[0] if hits else None
+        return SceneResult(
+            scene=scene,
+            score=scores[scene] if scene is not None else None,
+            scores=scores,
+            hits=hits,
+            elapsed_ms=(time.perf_counter() - t0) * 1000,
+            frame=frame,
+        )
+
+    def classify_predicted(
+        self,
+        region: Union[Rect, Frame],
+        threshold: float,
+        candidates: Optional[Iterable[str]],
+    ) -> SceneResult:
+        """
+        先只匹配 candidates（通常来自 SceneTransitions.candidates）。有命中时，再在同一帧上确认优先级更高、
+        但不在 candidates 中的场景都未出现，只省去排在命中场景之后的匹配；无命中时在同一帧上补全其余场景。
+        两种情况下 scene 都与 classify 的完整扫描相同。candidates 为 None 时直接完整扫描。
+        """
+        if candidates is None:
+            return self.classify(region, threshold)
+        candidates = tuple(candidates)
+        first = self.classify(region, threshold, candidates)
+        if first.frame is None:
+            return first
+        if first.scene is None:
+            return self._merge(first, self.classify(first.frame, threshold, [n for n in self.names if n not in candidates]))
+        higher = [n for n in self.names[: self.names.index(first.scene)] if n not in candidates]
+        result = self._merge(first, self.classify(first.frame, threshold, higher)) if higher else first
+        result.predicted = True
+        return result
+
+    def _merge(self, first: SceneResult, rest: SceneResult) -> SceneResult:
+        """合并同一帧上两次部分扫描的结果，优先级按构造时的场景顺序。"""
+        scores = {**first.scores, **rest.scores}
+        hits = set(first.hits) | set(rest.hits)
+        ordered_hits = tuple(n for n in self.names if n in hits)
+        scene = ordered_hits[0] if ordered_hits else None
+        return SceneResult(
+            scene=scene,
+            score=scores[scene] if scene is not None else None,
+            scores={n: scores[n] for n in self.names if n in scores},
+            hits=ordered_hits,
+            elapsed_ms=first.elapsed_ms + rest.elapsed_ms,
+            frame=first.frame,
+        )
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+挂机场景转移模型：从挂机历史中统计「上一个场景 -> 下一个场景」的次数，持久化在 settings.ini 旁。
+每个 tick 先只匹配上一场景之后最可能出现的几个场景，命中时再确认优先级更高的场景都未出现，
+未命中则在同一帧上补全其余场景（见 SceneClassifier.classify_predicted），完整的场景链始终是兜底。
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 持久化文件名（与 settings.ini 同目录）
+TRANSITIONS_FILE_NAME = "scene_transitions.json"
+
+# 某场景之后至少观察到这么多次转移才开始预测
+MIN_OBSERVATIONS = 5
+# 预测集合按概率从高到低累加，覆盖到该比例为止
+PREDICT_COVERAGE = 0.95
+# 预测集合最多包含的后继场景数（不含上一场景本身）
+PREDICT_TOP_K = 4
+# 单个场景的转移计数超过该值时整体减半，使模型能跟上玩法变化
+MAX_ROW_COUNT = 200
+
+
+class SceneTransitions:
+    """
+    transitions[prev][next]: 识别到 prev 之后、下一个不同的场景为 next 的次数（停留在同一场景不计）。
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.transitions: Dict[str, Dict[str, int]] = {}
+        self.last_scene: Optional[str] = None
+        self.predicted = 0
+        self.fallback = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "SceneTransitions":
+        """从 path 读取模型；文件不存在或损坏时返回空模型（之后 save 会覆盖）。"""
+        model = cls(path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            model.transitions = {
+                str(prev): {str(nxt): int(n) for nxt, n in row.items() if int(n) > 0}
+                for prev, row in data.get("transitions", {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        return model
+
+    def save(self) -> bool:
+        """有新观察时写回文件，返回是否写入成功。"""
+        if self.path is None or not self._dirty:
+            return False
+        data = {"transitions": self.transitions}
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            return False
+        self._dirty = False
+        return True
+
+    def start_session(self) -> None:
+        """开始一次挂机：清空上一场景与本次统计，已学到的转移保留。"""
+        self.last_scene = None
+        self.predicted = 0
+        self.fallback = 0
+
+    def candidates(self, priority: Iterable[str], always: Iterable[str] = ()) -> Optional[Tuple[str, ...]]:
+        """
+        上一场景本身及其之后最可能出现的场景（加上 always），按 priority 的顺序返回；
+        尚无上一场景或观察不足时返回 None，表示需要完整扫描。
+        """
+        row = self.transitions.get(self.last_scene) if self.last_scene is not None else None
+        total = sum(row.values()) if row else 0
+        if total < MIN_OBSERVATIONS:
+            return None
+        picked: List[str] = [self.last_scene]
+        covered = 0
+        for scene, n in sorted(row.items(), key=lambda kv: kv[1], reverse=True):
+            if len(picked) > PREDICT_TOP_K or covered >= PREDICT_COVERAGE * total:
+                break
+            picked.append(scene)
+            covered += n
+        wanted = set(picked) | set(always)
+        return tuple(s for s in priority if s in wanted)
+
+    def observe(self, scene: Optional[str]) -> None:
+        """记录本 tick 分派的场景；scene 为 None（未识别到任何场景）时不计入转移。"""
+        if scene is None:
+            return
+        if self.last_scene is not None and scene != self.last_scene:
+            row = self.transitions.setdefault(self.last_scene, {})
+            row[scene] = row.get(scene, 0) + 1
+            if sum(row.values()) > MAX_ROW_COUNT:
+                for key in list(row):
+                    row[key] //= 2
+                    if row[key] == 0:
+                        del row[key]
+            self._dirty = True
+        self.last_scene = scene
+
+    def note_scan(self, predicted: bool) -> None:
+        """记录本 tick 是由预测集合给出结果（True）还是回退到完整扫描（False）。"""
+        if predicted:
+            self.predicted += 1
+        else:
+            self.fallback += 1
+
+    def format_stats(self) -> str:
+        total = self.predicted + self.fallback
+        rate = self.predicted / total if total else 0.0
+        return f"预测命中 {self.predicted}/{total} 次（{rate:.0%}），完整扫描 {self.fallback} 次"
@@ -18,6 +18,9 @@ if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
 from Utils.find_image import find_image_with_score, get_image_center
+from Utils.frame import Frame
+from Utils.frame_gate import FrameGate
+from Utils.poll_scheduler import AdaptivePoller
 
 
 SEARCH_RECT = (0, 0, 1366, 768)
@@ -63,7 +66,10 @@ class PartyBugApp:
             self.cp.read(self.ini_file, encoding="utf-8-sig")
 
         self.match_threshold = 0.95
+        # 轮询间隔：动作之后 fast，画面有变化时 base，画面不变时逐步退避到 slow
+        self.poll_fast_seconds = 0.1
         self.poll_interval_seconds = 0.3
+        self.poll_slow_seconds = 1.5
         self.game_key_hold_seconds = 0.05
         self.double_c_interval_seconds = 0.2
         self.up_press_hold_seconds = 0.05
@@ -84,6 +90,8 @@ class PartyBugApp:
         self._f12_hotkey_ref = None
         self.need_activate_window_once = False
         self.auto_stop_deadline: Optional[float] = None
+        self.frame_gate = FrameGate()
+        self.poller = AdaptivePoller(self.poll_fast_seconds, self.poll_interval_seconds, self.poll_slow_seconds)
 
         self.root = tk.Tk()
         self.root.title("好不厉害组队")
@@ -417,9 +425,10 @@ class PartyBugApp:
             time.sleep(0.02)
         return True
 
-    def _find(self, image_name: str) -> tuple[bool, Optional[float]]:
+    def _find(self, image_name: str, frame: Optional[Frame] = None) -> tuple[bool, Optional[float]]:
+        """frame 为本 tick 已截好的画面时直接在其上匹配，否则实时截图。"""
         return find_image_with_score(
-            SEARCH_RECT, self.picture_dir / image_name, threshold=self.match_threshold
+            frame if frame is not None else SEARCH_RECT, self.picture_dir / image_name, threshold=self.match_threshold
         )
 
     def _click_if_found(self, image_name: str) -> bool:
@@ -488,17 +497,24 @@ class PartyBugApp:
             self._key_up_game(hold_key)
             self._key_up_game(reverse_key)
 
-    def process_once(self) -> None:
+    def process_once(self, frame: Optional[Frame] = None) -> bool:
+        """
+        执行一轮场景判断。frame 为本 tick 已截好的画面：命中某场景并开始执行动作之前的判断都在这一帧上完成，
+        之后的判断改为实时截图。返回是否命中了任一场景。
+        """
         self._activate_window_once_if_needed()
+        acted = False
 
-        found_nameless, score_nameless = self._find("无名村.png")
+        found_nameless, score_nameless = self._find("无名村.png", frame)
         if found_nameless:
+            acted = True
+            frame = None
             self._log(f"[无名村] ，开始进入图书馆...")
             if not self._wait_or_stop(0.5):
-                return
+                return acted
             for name in ("下拉.png", "次元.png", "图书馆.png", "移动.png"):
                 if self.stop_event.is_set():
-                    return
+                    return acted
                 if not self._click_if_found(name):
                     self._log(f"[无名村] 未找到 {name}，流程终止")
                     break
@@ -506,52 +522,74 @@ class PartyBugApp:
                 cur_x, cur_y = pyautogui.position()
                 pyautogui.moveTo(cur_x + 50, cur_y)
                 if not self._wait_or_stop(self.pre_click_interval_seconds):
-                    return
+                    return acted
 
-        found_team_map, score_team_map = self._find("图书馆地图.png")
+        found_team_map, score_team_map = self._find("图书馆地图.png", frame)
         if found_team_map:
+            acted = True
+            frame = None
             self._log(f"[图书馆地图] 准备离开...")
             self._run_until_image_disappears("图书馆地图.png", "left")
 
-        found_guild, score_guild = self._find("工会大厅.png")
+        found_guild, score_guild = self._find("工会大厅.png", frame)
         if found_guild:
+            acted = True
+            frame = None
             self._log(f"[工会大厅] 准备离开...")
             self._run_until_image_disappears("工会大厅.png", "right")
 
-        found_spec_exit, score_spec = self._find("光谱退场.png")
+        found_spec_exit, score_spec = self._find("光谱退场.png", frame)
         if found_spec_exit:
+            acted = True
             self._log(f"[光谱退场] 命中")
             if self._click_if_found("光谱退场npc.png"):
                 self._log("[光谱退场] 点击光谱退场npc")
                 cur_x, cur_y = pyautogui.position()
                 pyautogui.moveTo(cur_x + 50, cur_y)
                 if not self._wait_or_stop(0.2):
-                    return
+                    return acted
                 self._tap_key(self.gather_key)
                 if not self._wait_or_stop(self.double_c_interval_seconds):
-                    return
+                    return acted
                 self._tap_key(self.gather_key)
                 self._log("[光谱退场] 按采集键")
             else:
                 self._log("[光谱退场] 未找到 光谱退场npc")
+        return acted
 
     def _worker_loop(self) -> None:
         self._log("[系统] 监控开始")
+        gate = self.frame_gate
+        gate.reset()
+        poller = self.poller
+        poller.reset()
         try:
             while not self.stop_event.is_set():
                 if self.auto_stop_deadline is not None and time.monotonic() >= self.auto_stop_deadline:
                     self._log("[系统] 定时时间已到，自动停止。")
                     self.root.after(0, self.stop)
                     break
-                self.process_once()
+                try:
+                    frame: Optional[Frame] = Frame.grab(SEARCH_RECT)
+                except Exception:
+                    frame = None
+                # 上一轮完整判断未命中任何场景且画面没变：本轮结果必然相同，跳过找图
+                changed = frame is None or self.need_activate_window_once or gate.changed(frame)
+                if changed:
+                    if frame is not None:
+                        gate.accept(frame)
+                    if self.process_once(frame):
+                        gate.invalidate()
+                        poller.kick()
                 if self.stop_event.is_set():
                     break
-                if not self._wait_or_stop(self.poll_interval_seconds):
+                if not self._wait_or_stop(poller.next_interval(changed)):
                     break
         except Exception as e:
             self._log(f"[异常] {e}")
             self.root.after(0, self.stop)
             return
+        self._log(f"[系统] {gate.format_stats()}，{poller.format_stats()}")
         self._log("[系统] 监控已停止")
 
     def _on_hotkey_toggle(self) -> None:
@@ -0,0 +1,208 @@
+"""
+找图热路径基准测试：回放录好的截图，用各工具真实的模板集测量一轮找图在各阶段的耗时。
+
+阶段：capture（截图）、convert（RGB 转灰度）、decode（读取模板，首轮为冷缓存）、match（模板匹配）。
+输出各阶段 p50/p90/p99 延迟（毫秒）与每秒轮数，可对比不同截图后端、匹配模式（exact/pyramid）与 ROI 开关。
+
+用法（在项目根目录下运行）：
+    python -m Utils.benchmark --frames 录屏目录 --suite cube,party --mode exact,pyramid --roi off,on
+    python -m Utils.benchmark --record 录屏目录 --count 30 --interval 0.5    # 在游戏画面上录制回放用截图
+
+不指定 --frames 时用模板拼出的合成画面（只适合比较实现快慢，不代表真实命中率）。
+默认 --backend replay，不需要显示器，Linux 上也能跑；mss / pyautogui 则截取真实屏幕。
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from . import find_image as fi
+from .capture import ReplayBackend, get_capture_backend, set_capture_backend
+from .frame import Frame
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+SCREEN_REGION = (0, 0, 1366, 768)
+
+# 各工具一轮找图使用的模板集：(模板目录, 文件名过滤, 匹配方式)
+# all = 每个模板找出全部命中（Cube / MonsterCard / Enchant 的词条识别）；best = 每个模板取最高分（Party 场景识别）
+SUITES = {
+    "cube": (_ROOT / "Cube" / "picture", "*.png", "all"),
+    "monster_one": (_ROOT / "MonsterCard" / "picture" / "one", "*.png", "all"),
+    "monster_three": (_ROOT / "MonsterCard" / "picture" / "three", "*.png", "all"),
+    "enchant": (_ROOT / "Enchant" / "picture", "*_enchant.png", "all"),
+    "party": (_ROOT / "Party" / "picture", "*.png", "best"),
+}
+
+STAGES = ("capture", "convert", "decode", "match", "total")
+
+
+def suite_templates(name):
+    """返回套件的模板路径列表（排除说明图等大于屏幕的图片）。"""
+    folder, pattern, _ = SUITES[name]
+    paths = []
+    for p in sorted(folder.glob(pattern)):
+        if "说明" in p.stem:
+            continue
+        t = fi.load_template(p)
+        if t is None or t.shape[0] > SCREEN_REGION[3] or t.shape[1] > SCREEN_REGION[2]:
+            continue
+        paths.append(p)
+    return paths
+
+
+def synthetic_frames(paths, count=8, seed=0):
+    """用模板拼出合成画面：模糊噪声背景上随机贴若干模板（一半加轻微噪声）。"""
+    rng = np.random.default_rng(seed)
+    pick = random.Random(seed)
+    templates = [fi.load_template(p) for p in paths]
+    w, h = SCREEN_REGION[2], SCREEN_REGION[3]
+    frames = []
+    for _ in range(count):
+        bg = cv2.GaussianBlur(rng.integers(0, 255, (h, w), dtype=np.uint8), (0, 0), 3)
+        for _ in range(12):
+            t = pick.choice(templates)
+            y = pick.randrange(0, h - t.shape[0] + 1)
+            x = pick.randrange(0, w - t.shape[1] + 1)
+            patch = t.astype(np.int16)
+            if pick.random() < 0.5:
+                patch = patch + rng.integers(-6, 7, t.shape)
+            bg[y:y + t.shape[0], x:x + t.shape[1]] = np.clip(patch, 0, 255)
+        frames.append(cv2.cvtColor(bg, cv2.COLOR_GRAY2RGB))
+    return frames
+
+
+def run_round(paths, kind, pyramid, roi, timings):
+    """
+    执行一轮找图并把各阶段耗时（秒）追加到 timings，返回命中数。
+    与各工具一样走 Utils.find_image 的公开接口（Frame.grab / load_template / find_all_template / match_template），
+    耗时统计等包装开销也计入 match 阶段。
+    """
+    t0 = time.perf_counter()
+    frame = Frame.grab(SCREEN_REGION)
+    t1 = time.perf_counter()
+    frame.gray  # 触发灰度转换（懒计算）
+    t2 = time.perf_counter()
+    templates = [(p, fi.load_template(p)) for p in paths]
+    t3 = time.perf_counter()
+    hits = 0
+    for p, template in templates:
+        if template is None:
+            continue
+        if kind == "all":
+            hits += len(fi.find_all_template(frame, template, fi.MATCH_THRESHOLD, fi.MIN_MATCH_DISTANCE, pyramid, key=p))
+        else:
+            hits += fi.match_template(frame, template, fi.MATCH_THRESHOLD, pyramid, key=p, roi=roi)[0] is not None
+    t4 = time.perf_counter()
+    for stage, dt in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)):
+        timings[stage].append(dt)
+    return hits
+
+
+def bench_suite(name, rounds, pyramid, roi):
+    """对一个套件跑 rounds 轮，返回结果 dict。首轮前清空模板缓存，decode 的最大值即冷启动解码耗时。"""
+    paths = suite_templates(name)
+    kind = SUITES[name][2]
+    fi.clear_template_cache()
+    fi.clear_roi()
+    backend = get_capture_backend()
+    if isinstance(backend, ReplayBackend):
+        backend.reset()
+    timings = {stage: [] for stage in STAGES}
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hits += run_round(paths, kind, pyramid, roi, timings)
+    elapsed = time.perf_counter() - start
+    return {
+        "suite": name,
+        "templates": len(paths),
+        "rounds": rounds,
+        "hits": hits,
+        "rounds_per_sec": rounds / elapsed if elapsed > 0 else 0.0,
+        "timings": timings,
+        "roi": fi.roi_stats(),
+    }
+
+
+def _percentiles_ms(values):
+    arr = np.asarray(values) * 1000.0
+    return np.percentile(arr, [50, 90, 99]), arr.max()
+
+
+def print_report(result, backend_name, mode, roi):
+    print(f"\n[{result['suite']}] 后端={backend_name} 模式={mode} ROI={'on' if roi else 'off'} "
+          f"模板={result['templates']} 轮数={result['rounds']} 命中={result['hits']} "
+          f"速度={result['rounds_per_sec']:.1f} 轮/秒")
+    print(f"  {'阶段':<8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+    for stage in STAGES:
+        (p50, p90, p99), mx = _percentiles_ms(result["timings"][stage])
+        print(f"  {stage:<8}{p50:>9.2f}{p90:>9.2f}{p99:>9.2f}{mx:>9.2f}")
+    if roi:
+        s = result["roi"]
+        print(f"  ROI 快速路径命中 {s['fast_hits']} / 未命中 {s['fast_misses']}（命中率 {s['fast_hit_rate']:.0%}）")
+
+
+def record_frames(out_dir, count, interval):
+    """用当前截图后端录制 count 张全屏截图到 out_dir（PNG，文件名按序号），供 --frames 回放。"""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        rgb = get_capture_backend().grab(SCREEN_REGION)
+        ok, data = cv2.imencode(".png", cv2.cvtColor(np.ascontiguousarray(rgb), cv2.COLOR_RGB2BGR))
+        if ok:
+            (out / f"frame_{i:04d}.png").write_bytes(data.tobytes())
+            print(f"已保存 {out / f'frame_{i:04d}.png'}")
+        time.sleep(interval)
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="找图热路径基准测试（回放截图，无需显示器）")
+    parser.add_argument("--frames", help="回放截图目录（*.png，1366x768 全屏截图）；不指定则用合成画面")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"逗号分隔的套件：{','.join(SUITES)}")
+    parser.add_argument("--backend", default="replay", choices=("replay", "mss", "pyautogui"), help="截图后端")
+    parser.add_argument("--mode", default="exact", help="逗号分隔的匹配模式：exact,pyramid")
+    parser.add_argument("--roi", default="off", help="逗号分隔的 ROI 开关：off,on")
+    parser.add_argument("--rounds", type=int, default=50, help="每个组合跑的轮数")
+    parser.add_argument("--record", metavar="DIR", help="录制模式：把当前屏幕截图保存到 DIR 后退出")
+    parser.add_argument("--count", type=int, default=30, help="录制张数")
+    parser.add_argument("--interval", type=float, default=0.5, help="录制间隔（秒）")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        if args.backend != "replay":
+            set_capture_backend(args.backend)
+        record_frames(args.record, args.count, args.interval)
+        return 0
+
+    suites = _split(args.suite)
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"未知套件: {', '.join(unknown)}")
+
+    for name in suites:
+        if args.backend == "replay":
+            if args.frames:
+                backend = ReplayBackend(args.frames)
+            else:
+                backend = ReplayBackend(synthetic_frames(suite_templates(name)))
+            set_capture_backend(backend)
+        else:
+            set_capture_backend(args.backend)
+        for mode in _split(args.mode):
+            for roi in _split(args.roi):
+                result = bench_suite(name, args.rounds, mode == "pyramid", roi == "on")
+                print_report(result, args.backend, mode, roi == "on")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+截图后端：统一的 grab_screen(region) -> RGB numpy 数组。
+
+- PyAutoGUIBackend：原有方式，pyautogui.screenshot 生成 PIL 图再转 numpy。
+- MssBackend：用 mss 直接截到内存，省去 PIL 图像的中转，开销更小（需 pip install mss）。
+- ReplayBackend：回放录好的 PNG 或 numpy 画面，可在无显示器的 Linux 上跑循环与基准测试。
+
+默认优先使用 mss，未安装时回退到 pyautogui；可用 set_capture_backend 切换。
+"""
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+try:
+    import mss
+    HAS_MSS = True
+except ImportError:
+    HAS_MSS = False
+
+
+class CaptureBackend:
+    """截图后端基类。grab(region) 截取 (x1, y1, x2, y2)，返回 (h, w, 3) 的 RGB uint8 数组。"""
+
+    name = "base"
+
+    def grab(self, region):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGUIBackend(CaptureBackend):
+    """pyautogui.screenshot 截图，每次返回新数组。"""
+
+    name = "pyautogui"
+
+    def grab(self, region):
+        import pyautogui
+
+        x1, y1, x2, y2 = region
+        screenshot = pyautogui.screenshot(region=(x1, y1, x2 - x1, y2 - y1))
+        return np.asarray(screenshot)
+
+
+class MssBackend(CaptureBackend):
+    """
+    mss 截图，BGRA 原始数据直接转成 RGB。
+    每个线程各自持有 mss 实例（mss 不可跨线程共用）；每次返回新数组，
+    之前截到的画面（及由它生成的 Frame）不会被后续截图覆盖。
+    """
+
+    name = "mss"
+
+    def __init__(self):
+        if not HAS_MSS:
+            raise RuntimeError("未安装 mss，请先 pip install mss")
+        self._local = threading.local()
+
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+        return sct
+
+    def grab(self, region):
+        x1, y1, x2, y2 = region
+        shot = self._sct().grab({"left": int(x1), "top": int(y1), "width": int(x2 - x1), "height": int(y2 - y1)})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB)
+
+    def close(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+def _read_rgb(path):
+    """读取 PNG 等图片为 RGB 数组（支持中文路径）。"""
+    data = np.frombuffer(Path(path).read_bytes(), dtype=np.uint8)
+    bgr = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if bgr is None:
+        raise ValueError(f"无法读取画面: {path}")
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    回放录好的画面：每次 grab 依次取下一帧，并按 region 裁剪（画面左上角视为屏幕 (0, 0)）。
+    frames 可以是目录（按文件名排序读取其中的 *.png）、图片路径列表或 RGB 数组列表。
+    loop=True 时播完从头循环，否则停在最后一帧。
+    """
+
+    name = "replay"
+
+    def __init__(self, frames, loop=True):
+        if isinstance(frames, (str, Path)):
+            frames = sorted(Path(frames).glob("*.png"))
+        self._frames = []
+        for f in frames:
+            arr = f if isinstance(f, np.ndarray) else _read_rgb(f)
+            if arr.ndim == 2:
+                arr = cv2.cvtColor(arr, cv2.COLOR_GRAY2RGB)
+            arr = np.ascontiguousarray(arr[:, :, :3])
+            arr.setflags(write=False)
+            self._frames.append(arr)
+        if not self._frames:
+            raise ValueError("ReplayBackend 至少需要一帧画面")
+        self.loop = loop
+        self.grab_count = 0
+        self._index = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def reset(self):
+        with self._lock:
+            self._index = 0
+            self.grab_count = 0
+
+    def grab(self, region):
+        with self._lock:
+            frame = self._frames[self._index]
+            self.grab_count += 1
+            if self._index + 1 < len(self._frames):
+                self._index += 1
+            elif self.loop:
+                self._index = 0
+        x1, y1, x2, y2 = (max(int(v), 0) for v in region)
+        return frame[y1:y2, x1:x2]
+
+
+_BACKEND_FACTORIES = {
+    "pyautogui": PyAutoGUIBackend,
+    "mss": MssBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _default_backend():
+    if HAS_MSS:
+        try:
+            return MssBackend()
+        except Exception:
+            pass
+    return PyAutoGUIBackend()
+
+
+def get_capture_backend():
+    """返回当前截图后端（首次调用时创建默认后端）。"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _default_backend()
+    return _backend
+
+
+def set_capture_backend(backend):
+    """
+    切换全局截图后端，返回之前的后端。
+    backend 可以是 CaptureBackend 实例，或名称 "mss" / "pyautogui"；None 表示恢复默认。
+    """
+    global _backend
+    if isinstance(backend, str):
+        backend = _BACKEND_FACTORIES[backend]()
+    with _backend_lock:
+        prev, _backend = _backend, backend
+    return prev
+
+
+def grab_screen(region):
+    """用当前后端截取 region (x1, y1, x2, y2)，返回 RGB 数组。"""
+    return get_capture_backend().grab(region)
@@ -1,15 +1,32 @@
 """
 通用工具：在指定区域内查找图片，可选点击图片中心。
 cv2 读取模板失败时回退到 PIL。
+模板按路径缓存（文件修改后自动失效），同一模板在进程内只解码一次。
+各函数可传 pyramid=True 走金字塔模式：缩小画面粗匹配得到候选，再用原图在候选附近精确验证；
+未命中时返回的最高匹配值为粗匹配的估计值，仅供日志参考。
+enable_profiling() 后按模板统计截图/转换/匹配耗时与命中情况，format_profile() 输出汇总文本。
+单点查找传 roi=True 时会记住模板上次命中的位置，下次先在其附近的小窗口内匹配，未命中再搜整个区域（见 roi_stats）；
+只适合画面上只出现一处的模板，默认不开启，始终返回整个区域内的最高分位置。
+各函数的 region 参数也可传入 Frame（见 Utils/frame.py），在同一帧画面上多次找图只截一次图。
 """
 import contextlib
 import os
+import threading
+import time
+from collections import OrderedDict
 
 import cv2
 import numpy as np
-import pyautogui
 from pathlib import Path
 
+try:
+    import pyautogui
+except Exception:  # 无显示环境（如 Linux 回放截图）下 pyautogui 不可用，仅影响点击
+    pyautogui = None
+
+from .frame import Frame
+from .nms import suppress_peaks
+
 try:
     from PIL import Image
     HAS_PIL = True
@@ -27,6 +44,26 @@ except Exception:
 
 MATCH_THRESHOLD = 0.99
 
+# 多处命中时的最小间距（像素），小于此距离视为同一位置
+MIN_MATCH_DISTANCE = 10
+
+# 模板缓存最多保留的模板数量（按最近使用淘汰）
+TEMPLATE_CACHE_SIZE = 256
+
+# 金字塔模式（pyramid=True）：先在缩小 PYRAMID_SCALE 倍的画面上粗匹配，再在候选点附近用原图精确验证
+PYRAMID_SCALE = 2
+# 粗匹配阈值按模板标定：模板自身在各缩放相位下的最低粗匹配分数，再减去余量
+# （余量 = PYRAMID_COARSE_MARGIN + 精确阈值距 1 的差 × 2），以免漏掉真实命中
+PYRAMID_COARSE_MARGIN = 0.1
+# 缩小后模板最短边不足此像素、或画面太小时不走金字塔，直接精确匹配
+PYRAMID_MIN_TEMPLATE = 8
+PYRAMID_MIN_AREA = 128 * 128
+# 粗匹配候选过多（如纯色模板）时放弃金字塔，回退精确匹配
+PYRAMID_MAX_CANDIDATES = 64
+
+# 上次命中位置四周外扩的像素数：先在该窗口内找，找不到再搜整个区域
+ROI_PADDING = 24
+
 
 @contextlib.contextmanager
 def _silence_stderr_fd():
@@ -78,135 +115,677 @@ def _load_template_gray(img_path_str):
     return None
 
 
-def _find_image_center_with_score(region, path, threshold=MATCH_THRESHOLD):
+class _TemplateCache:
+    """进程内模板灰度图缓存（线程安全）。
+
+    以解析后的绝对路径为键，并记录文件 mtime/size；文件被修改后自动重新解码。
+    超出 maxsize 时按最近最少使用（LRU）淘汰。解码失败的结果不缓存。
     """
-    在 region 内查找图片，返回 (中心坐标或None, 最高匹配值)。
-    未找到时中心为 None，但始终返回当次匹配的最高分数（便于日志输出）。
+
+    def __init__(self, maxsize=TEMPLATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # path_str -> (mtime_ns, size, template)
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """返回 path 对应的模板灰度图（只读 numpy 数组），文件不存在或无法解码返回 None。"""
+        p = Path(path)
+        try:
+            path_str = str(p.resolve())
+            st = os.stat(path_str)
+        except OSError:
+            return None
+        sig = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            item = self._items.get(path_str)
+            if item is not None and item[:2] == sig:
+                self._items.move_to_end(path_str)
+                self.hits += 1
+                return item[2]
+            self.misses += 1
+        template = _load_template_gray(path_str)
+        if template is None:
+            return None
+        # 缓存的数组会被多处共享，禁止写入以免被意外修改
+        template.setflags(write=False)
+        with self._lock:
+            self._items[path_str] = (sig[0], sig[1], template)
+            self._items.move_to_end(path_str)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_TEMPLATE_CACHE = _TemplateCache()
+
+
+def load_template(path):
+    """读取模板灰度图（带进程内缓存），文件不存在或无法解码返回 None。"""
+    return _TEMPLATE_CACHE.get(path)
+
+
+def template_cache_stats():
+    """返回模板缓存统计：{'size', 'maxsize', 'hits', 'misses'}。"""
+    return _TEMPLATE_CACHE.stats()
+
+
+def clear_template_cache():
+    """清空模板缓存及命中统计。"""
+    _TEMPLATE_CACHE.clear()
+
+
+class _HitWindows:
+    """记录每个模板最近一次命中的矩形（屏幕坐标），用于缩小下一次的搜索范围（线程安全）。
+
+    窗口标题、flag 等只出现一处的界面锚点几乎不会移动，先在上次位置外扩 padding 的小窗口内匹配，
+    命中即返回（快速路径）；未命中再回退到完整区域。只用于传了 roi=True 的单点查找，
+    find_all 等需要全部命中的函数仍搜整个区域。
     """
+
+    def __init__(self, padding=ROI_PADDING):
+        self.padding = padding
+        self.enabled = True
+        self.fast_hits = 0
+        self.fast_misses = 0
+        self.full_searches = 0
+        self._rects = {}  # key -> (x1, y1, x2, y2)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path):
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    def window(self, key, region, size):
+        """
+        返回 key 的快速搜索窗口（已裁到 region 内），没有记录、窗口放不下模板或与 region 相同时返回 None。
+        size 为模板 (w, h)。
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            rect = self._rects.get(key)
+        if rect is None:
+            return None
+        pad = self.padding
+        rx1, ry1, rx2, ry2 = region
+        x1, y1 = max(rect[0] - pad, rx1), max(rect[1] - pad, ry1)
+        x2, y2 = min(rect[2] + pad, rx2), min(rect[3] + pad, ry2)
+        if x2 - x1 < size[0] or y2 - y1 < size[1]:
+            return None
+        if (x1, y1, x2, y2) == tuple(region):
+            return None
+        return x1, y1, x2, y2
+
+    def record(self, key, topleft, size):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._rects[key] = (topleft[0], topleft[1], topleft[0] + size[0], topleft[1] + size[1])
+
+    def count(self, fast_hit=None):
+        """fast_hit=True/False 记一次快速路径命中/未命中，None 记一次完整区域搜索。"""
+        with self._lock:
+            if fast_hit is None:
+                self.full_searches += 1
+            elif fast_hit:
+                self.fast_hits += 1
+            else:
+                self.fast_misses += 1
+
+    def clear(self):
+        with self._lock:
+            self._rects.clear()
+            self.fast_hits = 0
+            self.fast_misses = 0
+            self.full_searches = 0
+
+    def stats(self):
+        with self._lock:
+            tried = self.fast_hits + self.fast_misses
+            return {
+                "enabled": self.enabled,
+                "tracked": len(self._rects),
+                "fast_hits": self.fast_hits,
+                "fast_misses": self.fast_misses,
+                "full_searches": self.full_searches,
+                "fast_hit_rate": self.fast_hits / tried if tried else 0.0,
+            }
+
+
+_HIT_WINDOWS = _HitWindows()
+
+
+def roi_stats():
+    """返回上次命中窗口（ROI）统计：{'enabled', 'tracked', 'fast_hits', 'fast_misses', 'full_searches', 'fast_hit_rate'}。"""
+    return _HIT_WINDOWS.stats()
+
+
+def clear_roi():
+    """清空所有模板的上次命中位置及统计。"""
+    _HIT_WINDOWS.clear()
+
+
+def set_roi_enabled(enabled):
+    """开启/关闭上次命中窗口的快速路径（关闭后每次都搜整个区域）。"""
+    _HIT_WINDOWS.enabled = bool(enabled)
+
+
+# 找图耗时直方图的分桶上界（毫秒），最后一档为超过 500ms
+PROFILE_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class _Profiler:
+    """
+    按模板路径统计找图耗时（默认关闭，enable_profiling 开启；线程安全）。
+
+    每次找图记一条：截图、灰度转换、模板匹配各自耗时，最高匹配值及是否命中。
+    同一帧上匹配多个模板时（match_many / 传入 Frame），截图与转换耗时只算在触发它的那次找图上。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self):
+        """开始记录一次找图（未开启时不做任何事）。"""
+        if self.enabled:
+            self._local.rec = {"capture": 0.0, "convert": 0.0, "match": 0.0}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """累计当前这次找图在 name 阶段的耗时。"""
+        rec = getattr(self._local, "rec", None)
+        if rec is None:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            rec[name] += time.perf_counter() - t0
+
+    def finish(self, path, score, hit):
+        """结束当前记录并计入 path 的统计。"""
+        rec = getattr(self._local, "rec", None)
+        self._local.rec = None
+        if rec is None:
+            return
+        total_ms = (rec["capture"] + rec["convert"] + rec["match"]) * 1000.0
+        bucket = len(PROFILE_BUCKETS_MS)
+        for i, edge in enumerate(PROFILE_BUCKETS_MS):
+            if total_ms <= edge:
+                bucket = i
+                break
+        key = str(path)
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None:
+                st = self._stats[key] = {
+                    "calls": 0, "hits": 0, "misses": 0,
+                    "capture_ms": 0.0, "convert_ms": 0.0, "match_ms": 0.0, "total_ms": 0.0,
+                    "max_total_ms": 0.0, "best_score": None, "last_score": None,
+                    "histogram": [0] * (len(PROFILE_BUCKETS_MS) + 1),
+                }
+            st["calls"] += 1
+            st["hits" if hit else "misses"] += 1
+            st["capture_ms"] += rec["capture"] * 1000.0
+            st["convert_ms"] += rec["convert"] * 1000.0
+            st["match_ms"] += rec["match"] * 1000.0
+            st["total_ms"] += total_ms
+            st["max_total_ms"] = max(st["max_total_ms"], total_ms)
+            st["histogram"][bucket] += 1
+            if score is not None:
+                st["last_score"] = score
+                if st["best_score"] is None or score > st["best_score"]:
+                    st["best_score"] = score
+
+    def discard(self):
+        self._local.rec = None
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self):
+        with self._lock:
+            return {k: dict(v, histogram=list(v["histogram"])) for k, v in self._stats.items()}
+
+
+_PROFILER = _Profiler()
+
+
+def enable_profiling(enabled=True):
+    """开启/关闭找图耗时统计（默认关闭，关闭时几乎没有额外开销）。"""
+    _PROFILER.enabled = bool(enabled)
+    if not enabled:
+        _PROFILER.discard()
+
+
+def profiling_enabled():
+    return _PROFILER.enabled
+
+
+def reset_profile():
+    """清空找图耗时统计。"""
+    _PROFILER.reset()
+
+
+def profile_stats():
+    """
+    返回找图耗时统计：dict，键为模板路径，值为
+    {'calls', 'hits', 'misses', 'capture_ms', 'convert_ms', 'match_ms', 'total_ms'（累计毫秒）,
+     'max_total_ms', 'best_score', 'last_score', 'histogram'（按 PROFILE_BUCKETS_MS 分桶的次数，末位为超出最后一档）}。
+    """
+    return _PROFILER.stats()
+
+
+def format_profile(top=None):
+    """把找图耗时统计整理成多行文本（按累计耗时从高到低），供各工具的日志窗口输出。"""
+    stats = profile_stats()
+    if not stats:
+        return "暂无找图统计（未开启或尚未找图）"
+    rows = sorted(stats.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+    if top is not None:
+        rows = rows[:top]
+    labels = [f"≤{e}" for e in PROFILE_BUCKETS_MS] + [f">{PROFILE_BUCKETS_MS[-1]}"]
+    lines = ["找图统计（毫秒，按累计耗时排序）："]
+    for path, st in rows:
+        n = st["calls"]
+        best = "-" if st["best_score"] is None else f"{st['best_score']:.4f}"
+        lines.append(
+            f"{Path(path).name}: 调用 {n} 次，命中 {st['hits']} / 未命中 {st['misses']}，"
+            f"平均 截图 {st['capture_ms'] / n:.1f} 转换 {st['convert_ms'] / n:.1f} 匹配 {st['match_ms'] / n:.1f}，"
+            f"累计 {st['total_ms']:.0f}，最慢 {st['max_total_ms']:.1f}，最高分 {best}"
+        )
+        hist = "，".join(f"{label}:{c}" for label, c in zip(labels, st["histogram"]) if c)
+        lines.append(f"    分布 {hist}")
+    return "\n".join(lines)
+
+
+def _as_frame(region):
+    """region 可以是 (x1, y1, x2, y2) 搜索区域，也可以是已截好的 Frame（直接复用，不再截图）。"""
+    if isinstance(region, Frame):
+        return region
+    with _PROFILER.stage("capture"):
+        return Frame.grab(region)
+
+
+_PYRAMID_TEMPLATES = OrderedDict()  # id(template) -> (template, 缩小后的模板, 自匹配最低粗分数)
+_PYRAMID_LOCK = threading.Lock()
+
+
+def _pyramid_template(template):
+    """
+    返回 (缩小后的模板内部, 自匹配最低粗分数)，按模板对象缓存。
+    缩小后的模板去掉四周各 1 像素：边缘像素在不同相位下会混入模板外的背景，只用内部保证粗分数只取决于模板本身。
+    自匹配分数：模板在各个缩放相位（偏移 0..scale-1 像素）下缩小后与之匹配的最低值，即真实命中可能得到的最低粗分数。
+    """
+    key = id(template)
+    with _PYRAMID_LOCK:
+        item = _PYRAMID_TEMPLATES.get(key)
+        if item is not None and item[0] is template:
+            _PYRAMID_TEMPLATES.move_to_end(key)
+            return item[1], item[2]
+    scale = PYRAMID_SCALE
+    th, tw = template.shape[:2]
+    small_tpl = cv2.resize(template, (tw // scale, th // scale), interpolation=cv2.INTER_AREA)[1:-1, 1:-1]
+    self_score = 1.0
+    for dy in range(scale):
+        for dx in range(scale):
+            shifted = template[dy:, dx:]
+            size = (shifted.shape[1] // scale, shifted.shape[0] // scale)
+            small = cv2.resize(shifted[:size[1] * scale, :size[0] * scale], size, interpolation=cv2.INTER_AREA)
+            score = float(cv2.matchTemplate(small, small_tpl, cv2.TM_CCOEFF_NORMED).max())
+            self_score = min(self_score, score)
+    with _PYRAMID_LOCK:
+        _PYRAMID_TEMPLATES[key] = (template, small_tpl, self_score)
+        while len(_PYRAMID_TEMPLATES) > TEMPLATE_CACHE_SIZE:
+            _PYRAMID_TEMPLATES.popitem(last=False)
+    return small_tpl, self_score
+
+
+def _pyramid_score_map(frame, template, threshold):
+    """
+    金字塔模式的得分图：与 cv2.matchTemplate 结果同尺寸，只有粗匹配候选附近的窗口填入精确分数，其余为 -1。
+    不适合走金字塔（模板太小、画面太小、候选过多）时返回 None。
+    """
+    scale = PYRAMID_SCALE
+    screen_gray = frame.gray
+    th, tw = template.shape[:2]
+    rh, rw = screen_gray.shape[0] - th + 1, screen_gray.shape[1] - tw + 1
+    if min(th, tw) // scale - 2 < PYRAMID_MIN_TEMPLATE or rh * rw < PYRAMID_MIN_AREA:
+        return None
+    small_tpl, self_score = _pyramid_template(template)
+    small_screen = frame.scaled_gray(scale)
+    if small_tpl.shape[0] > small_screen.shape[0] or small_tpl.shape[1] > small_screen.shape[1]:
+        return None
+    coarse = cv2.matchTemplate(small_screen, small_tpl, cv2.TM_CCOEFF_NORMED)
+    coarse_threshold = self_score - PYRAMID_COARSE_MARGIN - 2 * (1 - threshold)
+    candidates = suppress_peaks(coarse, coarse_threshold, 2)
+    if len(candidates) > PYRAMID_MAX_CANDIDATES:
+        return None
+    # 粗匹配点 (cx, cy) 对应模板左上角约在原图 ((cx-1)*scale, (cy-1)*scale)（模板内部去掉了 1 像素边）；
+    # 验证半径覆盖相位偏移、取整误差及 suppress_peaks 合并掉的相邻候选
+    radius = 3 * scale
+    result = np.full((rh, rw), -1.0, dtype=np.float32)
+    for cx, cy, _ in candidates:
+        bx, by = (cx - 1) * scale, (cy - 1) * scale
+        x0, y0 = max(bx - radius, 0), max(by - radius, 0)
+        x1, y1 = min(bx + radius, rw - 1), min(by + radius, rh - 1)
+        if x0 > x1 or y0 > y1:
+            continue
+        window = screen_gray[y0:y1 + th, x0:x1 + tw]
+        result[y0:y1 + 1, x0:x1 + 1] = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+    if not candidates:
+        # 没有候选时保留粗匹配最高分，供未命中日志参考
+        result[0, 0] = float(coarse.max())
+    return result
+
+
+def _score_map(frame, template, threshold, pyramid=False):
+    """模板在 frame 上的 TM_CCOEFF_NORMED 得分图；模板大于画面返回 None。pyramid=True 时先粗后精。"""
+    th, tw = template.shape[:2]
+    if th > frame.height or tw > frame.width:
+        return None
+    with _PROFILER.stage("convert"):
+        screen_gray = frame.gray
+    with _PROFILER.stage("match"):
+        if pyramid:
+            result = _pyramid_score_map(frame, template, threshold)
+            if result is not None:
+                return result
+        return cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+
+
+def _match_best(frame, template, threshold, pyramid=False):
+    """
+    在 frame 内匹配模板，返回 (左上角或None, 中心或None, 最高匹配值)。
+    坐标为屏幕坐标；模板大于画面时返回 (None, None, None)。
+    """
+    result = _score_map(frame, template, threshold, pyramid)
+    if result is None:
+        return None, None, None
+    th, tw = template.shape[:2]
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    if max_val < threshold:
+        return None, None, float(max_val)
+    topleft = (frame.left + max_loc[0], frame.top + max_loc[1])
+    center = (topleft[0] + tw // 2, topleft[1] + th // 2)
+    return topleft, center, float(max_val)
+
+
+def _match_all(frame, template, threshold, min_distance, pyramid=False):
+    """在 frame 内找出模板的全部不重叠命中，返回 [{'topleft', 'center', 'score', 'size'}]，按分数从高到低。"""
+    result = _score_map(frame, template, threshold, pyramid)
+    if result is None:
+        return []
+    th, tw = template.shape[:2]
+    matches = []
+    for mx, my, score in suppress_peaks(result, threshold, min_distance):
+        topleft = (frame.left + mx, frame.top + my)
+        matches.append({
+            "topleft": topleft,
+            "center": (topleft[0] + tw // 2, topleft[1] + th // 2),
+            "score": score,
+            "size": (tw, th),
+        })
+    return matches
+
+
+def _match_best_roi(region, key, template, threshold, pyramid=False):
+    """
+    带上次命中窗口的 _match_best：先在窗口内找（Frame 直接裁剪，区域元组只截窗口），
+    未命中再在完整 region 上找。返回值同 _match_best。
+    """
+    th, tw = template.shape[:2]
+    full = region.region if isinstance(region, Frame) else tuple(region)
+    win = _HIT_WINDOWS.window(key, full, (tw, th))
+    if win is not None:
+        sub = region.crop(win) if isinstance(region, Frame) else _as_frame(win)
+        topleft, center, max_val = _match_best(sub, template, threshold, pyramid)
+        if topleft is not None:
+            _HIT_WINDOWS.count(fast_hit=True)
+            _HIT_WINDOWS.record(key, topleft, (tw, th))
+            return topleft, center, max_val
+        _HIT_WINDOWS.count(fast_hit=False)
+    _HIT_WINDOWS.count()
+    frame = _as_frame(region)
+    topleft, center, max_val = _match_best(frame, template, threshold, pyramid)
+    if topleft is not None:
+        _HIT_WINDOWS.record(key, topleft, (tw, th))
+    return topleft, center, max_val
+
+
+def _find_image_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
+    """在 region 内查找图片，返回 (左上角或None, 中心或None, 最高匹配值)。"""
     img_path = Path(path)
     if not img_path.exists():
-        return None, None
-    img_path_str = str(img_path.resolve())
-    x1, y1, x2, y2 = region
-    left, top = x1, y1
-    width, height = x2 - x1, y2 - y1
+        return None, None, None
     try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        template = _load_template_gray(img_path_str)
-        if template is None or template.shape[0] > height or template.shape[1] > width:
-            return None, None
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
-        if max_val < threshold:
-            return None, float(max_val)
-        center_x = left + max_loc[0] + template.shape[1] // 2
-        center_y = top + max_loc[1] + template.shape[0] // 2
-        return (center_x, center_y), float(max_val)
+        template = load_template(img_path)
+        if template is None:
+            return None, None, None
+        _PROFILER.start()
+        if roi:
+            result = _match_best_roi(region, _HIT_WINDOWS.key(img_path), template, threshold, pyramid)
+        else:
+            result = _match_best(_as_frame(region), template, threshold, pyramid)
+        _PROFILER.finish(img_path, result[2], result[0] is not None)
+        return result
     except Exception:
-        return None, None
+        _PROFILER.discard()
+        return None, None, None
+
+
+def _find_image_center_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
+    """
+    在 region 内查找图片，返回 (中心坐标或None, 最高匹配值)。
+    未找到时中心为 None，但始终返回当次匹配的最高分数（便于日志输出）。
+    """
+    _, center, max_val = _find_image_with_score(region, path, threshold, pyramid, roi)
+    return center, max_val
 
 
-def _find_image_center(region, path, threshold=MATCH_THRESHOLD):
+def _find_image_center(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """在 region 内查找图片，返回匹配位置的图片中心坐标，未找到返回 None。"""
-    center, _ = _find_image_center_with_score(region, path, threshold)
+    center, _ = _find_image_center_with_score(region, path, threshold, pyramid, roi)
     return center
 
 
-def _find_image_topleft_with_score(region, path, threshold=MATCH_THRESHOLD):
+def _find_image_topleft_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """在 region 内查找图片，返回 (左上角坐标或None, 最高匹配值)。"""
-    img_path = Path(path)
-    if not img_path.exists():
-        return None, None
-    img_path_str = str(img_path.resolve())
-    x1, y1, x2, y2 = region
-    left, top = x1, y1
-    width, height = x2 - x1, y2 - y1
-    try:
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_RGB2GRAY)
-        template = _load_template_gray(img_path_str)
-        if template is None or template.shape[0] > height or template.shape[1] > width:
-            return None, None
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
-        if max_val < threshold:
-            return None, float(max_val)
-        topleft_x = left + max_loc[0]
-        topleft_y = top + max_loc[1]
-        return (topleft_x, topleft_y), float(max_val)
-    except Exception:
-        return None, None
+    topleft, _, max_val = _find_image_with_score(region, path, threshold, pyramid, roi)
+    return topleft, max_val
 
 
-def _find_image_topleft(region, path, threshold=MATCH_THRESHOLD):
+def _find_image_topleft(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """在 region 内查找图片，返回匹配位置的图片左上角坐标（屏幕坐标），未找到返回 None。"""
-    topleft, _ = _find_image_topleft_with_score(region, path, threshold)
+    topleft, _ = _find_image_topleft_with_score(region, path, threshold, pyramid, roi)
     return topleft
 
 
-def find_image(region, path, threshold=MATCH_THRESHOLD):
+def find_image(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """
     在 region 范围内查找 path 指定的图片。
-    :param region: (x1, y1, x2, y2) 搜索区域
+    :param region: (x1, y1, x2, y2) 搜索区域，或已截好的 Frame
     :param path: 模板图片路径
     :param threshold: 匹配阈值 (0~1)，默认 0.99
+    :param pyramid: True 时先在缩小的画面上粗匹配、再在候选附近精确验证，大区域找图更快，命中结果与逐点匹配一致
+    :param roi: True 时先在该模板上次命中位置附近的小窗口内找，命中即返回，未命中再搜整个区域；
+                窗口内的命中不一定是整个区域内的最高分，只适合画面上只出现一处的模板（窗口标题、flag 等）。
+                默认 False，始终返回整个区域内的最高分位置
     :return: 找到返回 True，否则返回 False
     """
-    return _find_image_center(region, path, threshold) is not None
+    return _find_image_center(region, path, threshold, pyramid, roi) is not None
 
 
-def get_image_center(region, path, threshold=MATCH_THRESHOLD):
+def get_image_center(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """
     在 region 内查找 path 图片，返回匹配位置的图片中心坐标。
-    :param region: (x1, y1, x2, y2) 搜索区域
+    :param region: (x1, y1, x2, y2) 搜索区域，或已截好的 Frame
     :param path: 模板图片路径
     :param threshold: 匹配阈值 (0~1)，默认 0.99
+    :param pyramid: 是否使用金字塔（先粗后精）匹配，见 find_image
+    :param roi: 是否先在上次命中位置附近找，见 find_image
     :return: 找到返回 (x, y)，否则返回 None
     """
-    return _find_image_center(region, path, threshold)
+    return _find_image_center(region, path, threshold, pyramid, roi)
+
+
+def get_image_center_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
+    """在 region 内查找 path 图片，返回 (中心或None, 最高匹配值)。"""
+    return _find_image_center_with_score(region, path, threshold, pyramid, roi)
 
 
-def get_image_topleft(region, path, threshold=MATCH_THRESHOLD):
+def get_image_topleft(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """在 region 内查找 path 图片，返回匹配位置的图片左上角坐标（屏幕坐标），未找到返回 None。"""
-    return _find_image_topleft(region, path, threshold)
+    return _find_image_topleft(region, path, threshold, pyramid, roi)
 
 
-def get_image_topleft_with_score(region, path, threshold=MATCH_THRESHOLD):
+def get_image_topleft_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """在 region 内查找 path 图片，返回 (左上角或None, 最高匹配值)。"""
-    return _find_image_topleft_with_score(region, path, threshold)
+    return _find_image_topleft_with_score(region, path, threshold, pyramid, roi)
 
 
-def find_image_and_click(region, path, threshold=MATCH_THRESHOLD):
+def find_image_and_click(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """
     在 region 内查找 path 图片，找到则点击图片中心。
     :return: 找到并点击返回 True，否则返回 False
     """
-    center, _ = _find_image_center_with_score(region, path, threshold)
+    center, _ = _find_image_center_with_score(region, path, threshold, pyramid, roi)
     if center is None:
         return False
     pyautogui.click(center[0], center[1])
     return True
 
 
-def find_image_and_click_with_score(region, path, threshold=MATCH_THRESHOLD):
+def find_image_and_click_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """
     在 region 内查找 path 图片，找到则点击图片中心。
     :return: (是否找到并点击, 最高匹配值)。未找到时最高匹配值可能为 None（如文件不存在）。
     """
-    center, max_val = _find_image_center_with_score(region, path, threshold)
+    center, max_val = _find_image_center_with_score(region, path, threshold, pyramid, roi)
     if center is None:
         return False, max_val
     pyautogui.click(center[0], center[1])
     return True, max_val
 
 
-def find_image_with_score(region, path, threshold=MATCH_THRESHOLD):
+def find_image_with_score(region, path, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
     """
     在 region 内查找 path 图片。
     :return: (是否找到, 最高匹配值)。未找到时最高匹配值可能为 None。
     """
-    center, max_val = _find_image_center_with_score(region, path, threshold)
+    center, max_val = _find_image_center_with_score(region, path, threshold, pyramid, roi)
     return center is not None, max_val
+
+
+def match_many(region, paths, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
+    """
+    只截一次图，在同一画面上匹配多个模板。
+    :param region: (x1, y1, x2, y2) 搜索区域，或已截好的 Frame
+    :param paths: 模板图片路径列表
+    :param threshold: 匹配阈值 (0~1)，默认 0.99
+    :param pyramid: 是否使用金字塔（先粗后精）匹配，见 find_image
+    :param roi: 是否先在各模板上次命中位置附近找，见 find_image
+    :return: dict，键为 paths 中的原路径，值为 {'center', 'topleft', 'score'}；
+             未达阈值时 center/topleft 为 None，模板缺失或截图失败时 score 也为 None。
+    """
+    paths = list(paths)
+    results = {p: {"center": None, "topleft": None, "score": None} for p in paths}
+    templates = [(p, load_template(p)) for p in paths]
+    if all(t is None for _, t in templates):
+        return results
+    _PROFILER.start()
+    try:
+        frame = _as_frame(region)
+    except Exception:
+        _PROFILER.discard()
+        return results
+    for p, template in templates:
+        if template is None:
+            continue
+        try:
+            if roi:
+                topleft, center, max_val = _match_best_roi(frame, _HIT_WINDOWS.key(p), template, threshold, pyramid)
+            else:
+                topleft, center, max_val = _match_best(frame, template, threshold, pyramid)
+        except Exception:
+            _PROFILER.discard()
+            _PROFILER.start()
+            continue
+        _PROFILER.finish(p, max_val, center is not None)
+        _PROFILER.start()
+        results[p] = {"center": center, "topleft": topleft, "score": max_val}
+    _PROFILER.discard()
+    return results
+
+
+def find_all(region, path, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE, pyramid=False):
+    """
+    在 region 内查找 path 图片的全部命中位置（同一张图可出现多次）。
+    :param min_distance: 两处命中的最小间距，更近的只保留分数高的
+    :param pyramid: 是否使用金字塔（先粗后精）匹配，见 find_image
+    :return: [{'topleft': (x, y), 'center': (x, y), 'score': float, 'size': (w, h)}, ...]，按分数从高到低；
+             未找到、模板缺失或截图失败时返回 []
+    """
+    template = load_template(path)
+    if template is None:
+        return []
+    return find_all_template(region, template, threshold, min_distance, pyramid, key=path)
+
+
+def match_template(region, template, threshold=MATCH_THRESHOLD, pyramid=False, key=None, roi=False):
+    """
+    用已加载的模板灰度图（如 TemplateBank 中的数组）查找最高分位置，不再按路径读取、stat 模板文件。
+    :param key: 模板标识（通常为模板路径），用于耗时统计，roi=True 时也用于记住上次命中位置
+    :param roi: 是否先在上次命中位置附近找，见 find_image；key 为 None 时忽略
+    :return: (左上角或None, 中心或None, 最高匹配值)，截图或匹配失败时为 (None, None, None)
+    """
+    _PROFILER.start()
+    try:
+        if key is None or not roi:
+            result = _match_best(_as_frame(region), template, threshold, pyramid)
+        else:
+            result = _match_best_roi(region, _HIT_WINDOWS.key(key), template, threshold, pyramid)
+    except Exception:
+        _PROFILER.discard()
+        return None, None, None
+    _PROFILER.finish(key if key is not None else "<template>", result[2], result[0] is not None)
+    return result
+
+
+def find_all_template(region, template, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE, pyramid=False, key=None):
+    """
+    find_all 的模板数组版本：用已加载的模板灰度图查找全部命中位置。
+    :param key: 模板标识，仅用于耗时统计
+    :return: 同 find_all
+    """
+    _PROFILER.start()
+    try:
+        frame = _as_frame(region)
+        matches = _match_all(frame, template, threshold, min_distance, pyramid)
+    except Exception:
+        _PROFILER.discard()
+        return []
+    _PROFILER.finish(key if key is not None else "<template>", matches[0]["score"] if matches else None, bool(matches))
+    return matches
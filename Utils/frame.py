@@ -0,0 +1,79 @@
+"""
+一次截图的封装：保存 RGB 画面及其屏幕偏移，灰度图按需转换并缓存。
+同一 tick 内多次找图可共用一个 Frame，避免重复截图与重复 cvtColor。
+"""
+import cv2
+
+from .capture import grab_screen
+
+
+class Frame:
+    """
+    一帧屏幕画面。
+    rgb 为 (h, w, 3) 的 numpy 数组，left/top 为画面左上角的屏幕坐标。
+    gray 首次访问时才转换，之后复用；crop 得到的子画面与原画面共享内存。
+    """
+
+    def __init__(self, rgb, left=0, top=0, gray=None):
+        self.rgb = rgb
+        self.left = int(left)
+        self.top = int(top)
+        self._gray = gray
+        self._parent = None
+        self._slices = None
+        self._scaled = {}
+
+    @classmethod
+    def grab(cls, region):
+        """用当前截图后端截取 region (x1, y1, x2, y2) 生成一帧。"""
+        return cls(grab_screen(region), region[0], region[1])
+
+    @property
+    def width(self):
+        return self.rgb.shape[1]
+
+    @property
+    def height(self):
+        return self.rgb.shape[0]
+
+    @property
+    def region(self):
+        """画面覆盖的屏幕区域 (x1, y1, x2, y2)。"""
+        return self.left, self.top, self.left + self.width, self.top + self.height
+
+    @property
+    def gray(self):
+        """灰度图（懒计算并缓存）；子画面直接切自父画面的灰度图。"""
+        if self._gray is None:
+            if self._parent is not None:
+                self._gray = self._parent.gray[self._slices]
+            else:
+                self._gray = cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY)
+        return self._gray
+
+    def scaled_gray(self, scale):
+        """按 1/scale 缩小的灰度图（INTER_AREA，懒计算并按 scale 缓存），供金字塔粗匹配使用。"""
+        small = self._scaled.get(scale)
+        if small is None:
+            gray = self.gray
+            size = (gray.shape[1] // scale, gray.shape[0] // scale)
+            small = self._scaled[scale] = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        return small
+
+    def crop(self, region):
+        """
+        取 region (x1, y1, x2, y2，屏幕坐标) 对应的子画面，超出部分自动裁掉。
+        只做 numpy 切片，不复制像素。
+        """
+        x1, y1, x2, y2 = region
+        fx1, fy1, fx2, fy2 = self.region
+        x1, y1 = max(int(x1), fx1), max(int(y1), fy1)
+        x2, y2 = max(min(int(x2), fx2), x1), max(min(int(y2), fy2), y1)
+        slices = (slice(y1 - self.top, y2 - self.top), slice(x1 - self.left, x2 - self.left))
+        sub = Frame(self.rgb[slices], x1, y1)
+        if self._gray is not None:
+            sub._gray = self._gray[slices]
+        else:
+            sub._parent = self
+            sub._slices = slices
+        return sub
@@ -0,0 +1,75 @@
+"""
+画面变化门控：把整帧灰度图缩成缩略图，与上一次完整找图时的缩略图比较。
+画面没有变化（如长时间的小游戏、读条画面）时直接复用上次的识别结果，跳过模板匹配。
+
+按缩略图单个格子的最大差值判断而不是整帧平均差，小图标出现/消失也能被察觉；
+另外每隔 MAX_REUSE_SECONDS 强制完整找图一次，作为兜底。
+"""
+import time
+
+import cv2
+import numpy as np
+
+# 缩略图尺寸 (w, h)；1366x768 时每格约 21x21 像素
+THUMB_SIZE = (64, 36)
+
+# 任一格子的灰度平均值变化超过该值即视为画面变化（0~255）
+CELL_DIFF_THRESHOLD = 6
+
+# 连续复用上次结果的最长时间（秒），超过后强制完整找图
+MAX_REUSE_SECONDS = 5.0
+
+
+def thumbnail(frame):
+    """Frame 的灰度缩略图（int16，便于直接相减）。"""
+    return cv2.resize(frame.gray, THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+class FrameGate:
+    """
+    用法：每个 tick 先 changed(frame)；返回 False 时复用上次结果，
+    返回 True 时完整找图，并调用 accept(frame) 把该帧记为新的参照。
+    """
+
+    def __init__(self, threshold=CELL_DIFF_THRESHOLD, max_reuse_seconds=MAX_REUSE_SECONDS):
+        self.threshold = threshold
+        self.max_reuse_seconds = max_reuse_seconds
+        self.reset()
+
+    def reset(self):
+        """清空参照帧与统计（开始一次挂机时调用）。"""
+        self._ref = None
+        self._ref_time = 0.0
+        self._thumb = None
+        self.evaluated = 0
+        self.skipped = 0
+
+    def diff(self, frame):
+        """frame 与参照帧缩略图的最大格子差值；没有参照帧或尺寸不同时返回 None。"""
+        self._thumb = thumbnail(frame)
+        if self._ref is None or self._ref.shape != self._thumb.shape:
+            return None
+        return int(np.abs(self._thumb - self._ref).max())
+
+    def changed(self, frame):
+        """画面相对参照帧是否有变化（需要完整找图）；未变化时计入 skipped。"""
+        d = self.diff(frame)
+        if d is None or d > self.threshold or time.monotonic() - self._ref_time >= self.max_reuse_seconds:
+            return True
+        self.skipped += 1
+        return False
+
+    def accept(self, frame=None):
+        """把 frame（默认为最近一次 changed 的帧）记为完整找图的参照帧。"""
+        self._ref = thumbnail(frame) if frame is not None else self._thumb
+        self._ref_time = time.monotonic()
+        self.evaluated += 1
+
+    def invalidate(self):
+        """丢弃参照帧：执行过点击/按键等动作后调用，下一 tick 必定完整找图。"""
+        self._ref = None
+
+    def format_stats(self):
+        total = self.evaluated + self.skipped
+        rate = self.skipped / total if total else 0.0
+        return f"完整找图 {self.evaluated} 次，画面未变跳过 {self.skipped} 次（{rate:.0%}）"
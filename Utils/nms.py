@@ -0,0 +1,54 @@
+"""
+模板匹配结果的非极大值抑制（NMS）：把 matchTemplate 的得分图变成去重后的命中点列表。
+
+原先各工具把 np.where(result >= threshold) 全部转成 Python 列表，再两两算距离（O(n²)），
+低阈值或纯色模板产生成千上万个候选时一轮要好几秒。这里仍是同一个逐点贪心
+（按分数从高到低、距离已保留点 < min_distance 则丢弃），结果与原先完全一致，
+只是取候选、排序用 numpy 完成，并按 min_distance 建网格，每个候选只与相邻 3x3 格中已保留的点比较，
+整体接近线性。
+"""
+import numpy as np
+
+
+def suppress_peaks(result, threshold, min_distance):
+    """
+    对 cv2.matchTemplate 的得分图做非极大值抑制。
+    :param result: matchTemplate 返回的二维 float32 得分图
+    :param threshold: 得分阈值，>= threshold 才算命中
+    :param min_distance: 两个命中点的最小间距（像素，欧氏距离），小于此距离只保留得分高的
+    :return: [(x, y, score), ...]，x/y 为得分图坐标（即模板左上角相对搜索区域的偏移），按分数从高到低；
+             同分时按从上到下、从左到右的顺序
+    """
+    ys, xs = np.nonzero(result >= threshold)
+    if len(xs) == 0:
+        return []
+    scores = result[ys, xs]
+    order = np.argsort(-scores, kind="stable")
+    xs, ys, scores = xs[order], ys[order], scores[order]
+
+    if min_distance <= 0:
+        return [(int(x), int(y), float(s)) for x, y, s in zip(xs, ys, scores)]
+
+    # 贪心保留：按 min_distance 建网格，只与相邻 3x3 格中已保留的点比较
+    min_d2 = float(min_distance) ** 2
+    grid_size = float(min_distance)
+    grid = {}
+    kept = []
+    for x, y, s in zip(xs.tolist(), ys.tolist(), scores.tolist()):
+        gx, gy = int(x // grid_size), int(y // grid_size)
+        too_near = False
+        for nx in (gx - 1, gx, gx + 1):
+            for ny in (gy - 1, gy, gy + 1):
+                for ex, ey in grid.get((nx, ny), ()):
+                    if (x - ex) ** 2 + (y - ey) ** 2 < min_d2:
+                        too_near = True
+                        break
+                if too_near:
+                    break
+            if too_near:
+                break
+        if too_near:
+            continue
+        grid.setdefault((gx, gy), []).append((x, y))
+        kept.append((x, y, s))
+    return kept
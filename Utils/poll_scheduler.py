@@ -0,0 +1,62 @@
+"""
+自适应轮询间隔：刚执行过动作（即将切换画面）时快速轮询，画面长时间不变时按指数退避放慢，
+其余时候使用原先的固定间隔。只负责算出下一次等待多久，等待本身仍由各工具
+原有的可中断等待函数完成（smart_sleep / _wait_or_stop / _wait / _sleep_check_stop），停止响应不变。
+"""
+import time
+
+# 执行动作后保持快速轮询的时长（秒）
+FAST_WINDOW_SECONDS = 3.0
+
+# 画面不变时每次把间隔乘以该系数，直到 slow
+BACKOFF_FACTOR = 2.0
+
+
+class AdaptivePoller:
+    """
+    :param fast: 动作之后 fast_window 秒内的轮询间隔（秒）
+    :param base: 画面有变化时的轮询间隔，通常即原先写死的间隔
+    :param slow: 画面不变时退避的上限
+    用法：每轮找图后 next_interval(changed) 取得等待时长；执行了点击/按键等动作后 kick()。
+    """
+
+    def __init__(self, fast, base, slow, fast_window=FAST_WINDOW_SECONDS, factor=BACKOFF_FACTOR):
+        self.fast = fast
+        self.base = base
+        self.slow = max(slow, base)
+        self.fast_window = fast_window
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        """回到初始状态（开始一次挂机时调用）：视为刚执行过动作。"""
+        self._interval = self.base
+        self.last_kick = time.monotonic()
+        self._fast_until = self.last_kick + self.fast_window
+        self.polls = 0
+        self.total_wait = 0.0
+
+    def kick(self):
+        """刚执行过动作，接下来一段时间内快速轮询。其他线程可比较 last_kick 以提前结束当前等待。"""
+        self.last_kick = time.monotonic()
+        self._fast_until = self.last_kick + self.fast_window
+        self._interval = self.base
+
+    def next_interval(self, changed=True):
+        """
+        下一次轮询前应等待的秒数。
+        :param changed: 本轮画面是否有变化；不变时在上次间隔基础上退避，有变化时回到 base
+        """
+        if time.monotonic() < self._fast_until:
+            interval = self.fast
+        elif changed:
+            interval = self._interval = self.base
+        else:
+            interval = self._interval = min(self._interval * self.factor, self.slow)
+        self.polls += 1
+        self.total_wait += interval
+        return interval
+
+    def format_stats(self):
+        avg = self.total_wait / self.polls if self.polls else 0.0
+        return f"轮询 {self.polls} 次，平均间隔 {avg:.2f} 秒"
@@ -0,0 +1,139 @@
+"""
+终止条件的提前退出调度：按本次会话中各 key 的命中率，先匹配最少见的 key。
+
+条件组统一写成 [(key 元组, 需要次数), ...]：组内各项为与逻辑，组之间为或逻辑，
+一项满足指元组内各 key 的命中次数之和 >= 需要次数。
+洗装备时绝大多数轮次都不满足条件：先查最少见的 key，某一项一旦不可能满足就放弃整组，
+剩余各组都不需要的 key 不再匹配，一轮未命中通常只需匹配少数几个模板。
+"""
+import threading
+
+
+class HitRateTracker:
+    """
+    会话内各 key 的命中率（命中 = 命中次数 > 0），以及累计匹配 / 跳过的模板数。
+    命中率按 (命中轮数 + 1) / (匹配轮数 + 2) 平滑，从未匹配过的 key 视为 0.5。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._hits = {}
+            self._trials = {}
+            self.rounds = 0
+            self.probed = 0
+            self.skipped = 0
+            self.last_probed = 0
+            self.last_skipped = 0
+
+    def record(self, key, count):
+        """记录 key 本轮的命中次数。"""
+        with self._lock:
+            self._trials[key] = self._trials.get(key, 0) + 1
+            if count > 0:
+                self._hits[key] = self._hits.get(key, 0) + 1
+
+    def rate(self, key):
+        """key 的平滑命中率。"""
+        return (self._hits.get(key, 0) + 1) / (self._trials.get(key, 0) + 2)
+
+    def rarest(self, keys):
+        """keys 中命中率最低的一个（同率时取靠前的）。"""
+        return min(keys, key=self.rate)
+
+    def note_round(self, probed, skipped):
+        """记录一轮实际匹配与跳过的模板数。"""
+        with self._lock:
+            self.rounds += 1
+            self.probed += probed
+            self.skipped += skipped
+            self.last_probed = probed
+            self.last_skipped = skipped
+
+    def stats(self):
+        """返回 {'rounds', 'probed', 'skipped', 'skip_rate', 'rates': {key: 命中率}}。"""
+        with self._lock:
+            total = self.probed + self.skipped
+            return {
+                "rounds": self.rounds,
+                "probed": self.probed,
+                "skipped": self.skipped,
+                "skip_rate": self.skipped / total if total else 0.0,
+                "rates": {key: self.rate(key) for key in self._trials},
+            }
+
+    def format_stats(self):
+        """一行汇总，供日志使用。"""
+        s = self.stats()
+        return f"共 {s['rounds']} 轮，匹配 {s['probed']} 次，跳过 {s['skipped']} 次（{s['skip_rate']:.0%}）"
+
+
+def evaluate_groups(groups, probe, tracker=None, keys=None, exhaust_if_empty=False):
+    """
+    按命中率从低到高逐个匹配 key，尽早放弃不可能满足的组。
+    :param groups: [[(key 元组, 需要次数), ...], ...]
+    :param probe: probe(key) -> 本轮命中次数，只会对每个 key 调用一次
+    :param tracker: HitRateTracker；为 None 时按 key 在 groups 中出现的顺序匹配，且不统计
+    :param keys: 本轮全部可匹配的 key，用于统计跳过数与 exhaust_if_empty；默认为 groups 中出现的 key
+    :param exhaust_if_empty: 判定结束后若已匹配的 key 都未命中，继续按命中率从高到低匹配剩余 key，
+                             直到有一个命中（用于“一个词条都没找到就停止”之类的画面校验）
+    :return: (第一个满足的组下标或 None, {已匹配的 key: 命中次数})
+    """
+    group_keys = []
+    for group in groups:
+        for names, _ in group:
+            for key in names:
+                if key not in group_keys:
+                    group_keys.append(key)
+    universe = list(keys) if keys is not None else group_keys
+    counts = {}
+    alive = [True] * len(groups)
+    satisfied = None
+
+    def term_state(names, required):
+        n = sum(counts.get(k, 0) for k in names)
+        if n >= required:
+            return "met"
+        return "dead" if all(k in counts for k in names) else "open"
+
+    while True:
+        pending = []
+        for g, group in enumerate(groups):
+            if not alive[g]:
+                continue
+            states = [term_state(names, required) for names, required in group]
+            if "dead" in states:
+                alive[g] = False
+                continue
+            for (names, _), state in zip(group, states):
+                if state == "open":
+                    pending.extend(k for k in names if k not in counts and k not in pending)
+        first = next((g for g in range(len(groups)) if alive[g]), None)
+        if first is None:
+            break
+        if all(term_state(names, required) == "met" for names, required in groups[first]):
+            satisfied = first
+            break
+        # 在所有存活组的待查 key 中挑命中率最低的
+        key = tracker.rarest(pending) if tracker is not None else pending[0]
+        counts[key] = probe(key)
+        if tracker is not None:
+            tracker.record(key, counts[key])
+
+    if exhaust_if_empty and not any(counts.values()):
+        rest = [k for k in universe if k not in counts]
+        if tracker is not None:
+            rest.sort(key=tracker.rate, reverse=True)
+        for key in rest:
+            counts[key] = probe(key)
+            if tracker is not None:
+                tracker.record(key, counts[key])
+            if counts[key] > 0:
+                break
+
+    if tracker is not None:
+        tracker.note_round(len(counts), max(len(set(universe) | set(counts)) - len(counts), 0))
+    return satisfied, counts
@@ -0,0 +1,80 @@
+"""
+预加载的只读模板库：工具启动时一次性读取一组模板并校验尺寸，之后每轮直接用内存中的灰度数组匹配，
+不再逐次解析路径、stat 文件或解码。模板缺失、无法解码或比搜索区域还大时在加载时就报错，
+而不是每轮找图时被静默跳过。
+"""
+from pathlib import Path
+from types import MappingProxyType
+
+from .find_image import (
+    MATCH_THRESHOLD,
+    MIN_MATCH_DISTANCE,
+    find_all_template,
+    load_template,
+    match_template,
+)
+
+
+class TemplateBankError(ValueError):
+    """模板库加载失败（模板缺失 / 无法解码 / 比搜索区域大），消息可直接展示给用户。"""
+
+
+class TemplateBank:
+    """
+    一组按名称索引的模板灰度图（只读 numpy 数组）。
+    :param paths: {名称: 路径}，或路径列表（名称取文件名，如 final.png）
+    :param max_size: 搜索区域尺寸 (w, h)，模板宽或高超过它即视为错误；None 不校验
+    加载失败抛出 TemplateBankError，消息中列出全部有问题的模板。
+    """
+
+    def __init__(self, paths, max_size=None):
+        if not isinstance(paths, dict):
+            paths = {Path(p).name: p for p in paths}
+        templates = {}
+        missing = []
+        too_big = []
+        for name, path in paths.items():
+            template = load_template(path)
+            if template is None:
+                missing.append(name)
+                continue
+            h, w = template.shape[:2]
+            if max_size is not None and (w > max_size[0] or h > max_size[1]):
+                too_big.append(f"{name}({w}x{h})")
+                continue
+            templates[name] = template
+        errors = []
+        if missing:
+            errors.append("模板缺失或无法读取：" + "、".join(missing))
+        if too_big:
+            errors.append(f"模板比搜索区域({max_size[0]}x{max_size[1]})大：" + "、".join(too_big))
+        if errors:
+            raise TemplateBankError("；".join(errors))
+        self.paths = MappingProxyType({name: str(paths[name]) for name in templates})
+        self.templates = MappingProxyType(templates)
+        self.sizes = MappingProxyType({name: (t.shape[1], t.shape[0]) for name, t in templates.items()})
+        self.max_size = max_size
+
+    @property
+    def names(self):
+        return tuple(self.templates)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def __contains__(self, name):
+        return name in self.templates
+
+    def __getitem__(self, name):
+        return self.templates[name]
+
+    def find_all(self, region, name, threshold=MATCH_THRESHOLD, min_distance=MIN_MATCH_DISTANCE, pyramid=False):
+        """在 region（区域元组或 Frame）内查找 name 的全部命中位置，返回值同 Utils.find_image.find_all。"""
+        return find_all_template(region, self.templates[name], threshold, min_distance, pyramid, key=self.paths[name])
+
+    def find_best(self, region, name, threshold=MATCH_THRESHOLD, pyramid=False, roi=False):
+        """
+        在 region 内查找 name 的最高分位置，返回 (左上角或None, 中心或None, 最高匹配值)。
+        roi=True 时先在上次命中位置附近找，见 Utils.find_image.find_image。
+        """
+        return match_template(region, self.templates[name], threshold, pyramid, key=self.paths[name], roi=roi)
@@ -0,0 +1,73 @@
+"""Enchant 规则表与原先 condition1..16 条件链的对照。"""
+import itertools
+
+from Enchant.enchant_rules import RULES, STATS, AbilityRules, count_vector, format_counts
+from Utils.selectivity import evaluate_groups
+
+
+def _legacy(c, flags):
+    """原 build_enchant_execution 洗属性循环里的条件链。"""
+    atk, magic, all_, hp = c["atk"], c["magic"], c["all"], c["hp"]
+    str_ = c["str"] + all_
+    dex = c["dex"] + all_
+    int_ = c["int"] + all_
+    luk = c["luk"] + all_
+    conditions = [
+        atk >= 3,
+        atk >= 2,
+        atk >= 2 and all_ >= 1,
+        atk >= 2 and str_ >= 1,
+        atk >= 2 and dex >= 1,
+        atk >= 2 and luk >= 1,
+        atk >= 2 and hp >= 1,
+        atk >= 1 and all_ >= 2,
+        atk >= 1 and str_ >= 2,
+        atk >= 1 and dex >= 2,
+        atk >= 1 and luk >= 2,
+        atk >= 1 and hp >= 2,
+        magic >= 3,
+        magic >= 2,
+        magic >= 2 and int_ >= 1,
+        magic >= 1 and int_ >= 2,
+    ]
+    return any(ok and flags.get(f"c{i + 1}", False) for i, ok in enumerate(conditions))
+
+
+FLAG_CASES = [
+    {c: True for c in RULES},
+    {c: False for c in RULES},
+    {"c3": True, "c9": True, "c16": True},
+    {"c4": True, "c5": True, "c6": True, "c10": True, "c11": True},
+    {"c7": True, "c12": True, "c15": True},
+]
+
+
+def _cases():
+    # 攻 / 魔 各 0~3 条，另加两条其他词条（可重复）
+    for atk, magic in itertools.product(range(4), repeat=2):
+        for extra in itertools.combinations_with_replacement(("all", "str", "int", "hp", "dex", "luk"), 2):
+            c = dict.fromkeys(STATS, 0)
+            c.update(atk=atk, magic=magic)
+            for stat in extra:
+                c[stat] += 1
+            yield c
+
+
+def test_rules_match_legacy_conditions():
+    for flags in FLAG_CASES:
+        rules = AbilityRules(flags)
+        for c in _cases():
+            assert (rules.satisfied(count_vector(c)) is not None) == _legacy(c, flags), (flags, c)
+
+
+def test_groups_agree_with_matrix():
+    rules = AbilityRules({c: True for c in RULES})
+    for c in _cases():
+        idx, _ = evaluate_groups(rules.groups, lambda key: c[key])
+        expected = rules.satisfied(count_vector(c))
+        assert (rules.enabled[idx] if idx is not None else None) == expected, c
+
+
+def test_format_counts():
+    assert format_counts(count_vector({"atk": 2, "all": 1})) == "2攻，1全"
+    assert format_counts(count_vector({})) == ""
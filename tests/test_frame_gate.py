@@ -0,0 +1,71 @@
+"""FrameGate 的画面变化判断与复用超时。"""
+import time
+
+import numpy as np
+import pytest
+
+from Utils.frame import Frame
+from Utils.frame_gate import CELL_DIFF_THRESHOLD, FrameGate
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def _frame(gray):
+    return Frame(np.repeat(gray[:, :, None], 3, axis=2))
+
+
+def _screen(seed=0):
+    return np.random.default_rng(seed).integers(0, 255, (360, 640), dtype=np.uint8)
+
+
+def test_first_frame_and_after_invalidate_are_changed(clock):
+    gate = FrameGate()
+    frame = _frame(_screen())
+    assert gate.changed(frame)
+    gate.accept()
+    assert not gate.changed(frame)
+    gate.invalidate()
+    assert gate.changed(frame)
+
+
+def test_small_noise_is_reused_and_small_icon_is_changed(clock):
+    gate = FrameGate()
+    screen = _screen()
+    gate.changed(_frame(screen))
+    gate.accept()
+    noisy = np.clip(screen.astype(np.int16) + 2, 0, 255).astype(np.uint8)
+    assert not gate.changed(_frame(noisy))
+    icon = screen.copy()
+    icon[100:120, 200:220] = 255 - icon[100:120, 200:220]
+    assert gate.diff(_frame(icon)) > CELL_DIFF_THRESHOLD
+    assert gate.changed(_frame(icon))
+    assert (gate.evaluated, gate.skipped) == (1, 1)
+
+
+def test_reuse_expires(clock):
+    gate = FrameGate(max_reuse_seconds=5.0)
+    frame = _frame(_screen())
+    gate.changed(frame)
+    gate.accept()
+    clock[0] += 4.9
+    assert not gate.changed(frame)
+    clock[0] += 0.1
+    assert gate.changed(frame)
+    gate.accept()
+    assert not gate.changed(frame)
+
+
+def test_reset_clears_reference_and_stats(clock):
+    gate = FrameGate()
+    frame = _frame(_screen())
+    gate.changed(frame)
+    gate.accept()
+    assert not gate.changed(frame)
+    gate.reset()
+    assert (gate.evaluated, gate.skipped) == (0, 0)
+    assert gate.changed(frame)
@@ -0,0 +1,73 @@
+"""MonsterCard 规则表与原先手写条件链的对照。"""
+import itertools
+
+import numpy as np
+
+from MonsterCard.monster_rules import STATS, MonsterConditions, count_vector, format_counts
+
+
+def _legacy(c, flags):
+    """原 build_monster_execution._check_conditions_in_found_images 的条件链（以计数代替 found_images）。"""
+    enable_c2, enable_c3, enable_c4, enable_c5, enable_c6, enable_c7, sub = flags
+    final, atk, magic, skill_2 = c["final"], c["monster_atk"], c["monster_magic"], c["skill_2"]
+    condition1 = final >= 3
+    condition2 = final >= 2
+    subs = [
+        condition2 and atk >= 1,
+        condition2 and magic >= 1,
+        condition2 and c["monster_all"] >= 1,
+        condition2 and c["monster_str"] >= 1,
+        condition2 and c["monster_dex"] >= 1,
+        condition2 and c["monster_int"] >= 1,
+        condition2 and c["monster_luk"] >= 1,
+        condition2 and c["monster_cri"] >= 1,
+        condition2 and c["monster_hp"] >= 1,
+        condition2 and c["monster_ignore"] >= 1,
+        condition2 and c["monster_buff"] >= 1,
+        condition2 and skill_2 >= 1,
+    ]
+    condition3 = any(ok and on for ok, on in zip(subs, sub))
+    condition4 = (atk >= 2 or magic >= 2) and skill_2 >= 1
+    condition5 = final >= 1 and (atk >= 2 or magic >= 2)
+    condition6 = final >= 1 and skill_2 >= 1 and (atk >= 1 or magic >= 1)
+    condition7 = atk >= 3 or magic >= 3
+    satisfied = (condition1 or (condition2 and enable_c2) or (condition3 and enable_c3) or (condition4 and enable_c4)
+                 or (condition5 and enable_c5) or (condition6 and enable_c6) or (condition7 and enable_c7))
+    jackpot = condition1 or (subs[0] and sub[0]) or (subs[1] and sub[1])
+    return satisfied, jackpot
+
+
+FLAG_CASES = [
+    (False, False, False, False, False, False, (False,) * 12),
+    (True, False, False, False, False, False, (False,) * 12),
+    (False, True, False, False, False, False, (True,) * 12),
+    (False, True, False, False, False, False, (True, False) * 6),
+    (False, False, False, False, False, False, (True,) * 12),  # 子条件勾选但条件3未启用
+    (False, False, True, True, True, True, (False,) * 12),
+    (True, True, True, True, True, True, (True,) * 12),
+]
+
+
+def test_rules_match_legacy_conditions():
+    others = [s for s in STATS if s not in ("final", "monster_atk", "monster_magic", "skill_2")]
+    for flags in FLAG_CASES:
+        conditions = MonsterConditions(flags)
+        for final, atk, magic, skill_2 in itertools.product(range(4), repeat=4):
+            for other in [None, *others]:
+                c = dict.fromkeys(STATS, 0)
+                c.update(final=final, monster_atk=atk, monster_magic=magic, skill_2=skill_2)
+                if other is not None:
+                    c[other] = 1
+                counts = np.array([c[s] for s in STATS])
+                assert conditions.check(counts) == _legacy(c, flags), (flags, c)
+
+
+def test_count_vector_and_format():
+    found = [{"file": "picture/one/final.png"}, {"file": "picture/one/final.png"}, {"file": "picture/one/monster_atk.png"},
+             {"file": "picture/one/unknown.png"}]
+    counts = count_vector(found)
+    assert counts[STATS.index("final")] == 2
+    assert counts[STATS.index("monster_atk")] == 1
+    assert counts.sum() == 3
+    assert format_counts(counts) == "2终、1攻"
+    assert format_counts(count_vector([])) == ""
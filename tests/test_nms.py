@@ -0,0 +1,49 @@
+"""suppress_peaks 与原先逐点贪心去重（各工具的 _filter_matches）的对照。"""
+import math
+
+import numpy as np
+
+from Utils.nms import suppress_peaks
+
+
+def _legacy_filter(result, threshold, min_distance):
+    """原实现：np.where 取全部候选，按分数从高到低，距离已保留点 < min_distance 则丢弃。"""
+    ys, xs = np.where(result >= threshold)
+    matches = [(int(x), int(y), float(result[y, x])) for x, y in zip(xs, ys)]
+    matches.sort(key=lambda t: -t[2])
+    filtered = []
+    for x, y, score in matches:
+        if any(math.sqrt((x - ex) ** 2 + (y - ey) ** 2) < min_distance for ex, ey, _ in filtered):
+            continue
+        filtered.append((x, y, score))
+    return filtered
+
+
+def test_matches_legacy_on_random_maps():
+    rng = np.random.default_rng(0)
+    for i in range(60):
+        result = rng.random((40, 50)).astype(np.float32)
+        min_distance = (1, 3, 7.5, 10)[i % 4]
+        assert suppress_peaks(result, 0.7, min_distance) == _legacy_filter(result, 0.7, min_distance)
+
+
+def test_matches_legacy_on_plateaus_and_ties():
+    rng = np.random.default_rng(1)
+    for i in range(60):
+        result = (np.round(rng.random((30, 40)) * 3) / 3).astype(np.float32)
+        min_distance = (2, 5, 10)[i % 3]
+        assert suppress_peaks(result, 0.5, min_distance) == _legacy_filter(result, 0.5, min_distance)
+
+
+def test_flat_map_keeps_spaced_points():
+    result = np.ones((20, 20), dtype=np.float32)
+    kept = suppress_peaks(result, 0.9, 10)
+    assert kept == _legacy_filter(result, 0.9, 10)
+    assert kept[0] == (0, 0, 1.0)
+
+
+def test_no_hits_and_zero_distance():
+    result = np.zeros((5, 5), dtype=np.float32)
+    assert suppress_peaks(result, 0.5, 10) == []
+    result[1, 2] = result[1, 3] = 0.9
+    assert suppress_peaks(result, 0.5, 0) == [(2, 1, result[1, 2].item()), (3, 1, result[1, 3].item())]
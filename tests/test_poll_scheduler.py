@@ -0,0 +1,48 @@
+"""AdaptivePoller 的快速窗口、退避上限与 kick。"""
+import time
+
+import pytest
+
+from Utils.poll_scheduler import AdaptivePoller
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_fast_window_after_reset(clock):
+    poller = AdaptivePoller(0.2, 0.5, 2.0, fast_window=3.0)
+    assert poller.next_interval(changed=False) == 0.2
+    clock[0] += 3.0
+    assert poller.next_interval(changed=True) == 0.5
+
+
+def test_backoff_is_capped_at_slow(clock):
+    poller = AdaptivePoller(0.2, 0.5, 2.0, fast_window=0.0)
+    intervals = [poller.next_interval(changed=False) for _ in range(6)]
+    assert intervals == [1.0, 2.0, 2.0, 2.0, 2.0, 2.0]
+    assert poller.next_interval(changed=True) == 0.5
+    assert poller.next_interval(changed=False) == 1.0
+
+
+def test_kick_returns_to_fast_and_resets_backoff(clock):
+    poller = AdaptivePoller(0.2, 0.5, 2.0, fast_window=3.0)
+    clock[0] += 10
+    poller.next_interval(changed=False)
+    poller.next_interval(changed=False)
+    before = poller.last_kick
+    clock[0] += 1
+    poller.kick()
+    assert poller.last_kick > before
+    assert poller.next_interval(changed=False) == 0.2
+    clock[0] += 3.0
+    assert poller.next_interval(changed=False) == 1.0
+
+
+def test_slow_never_below_base(clock):
+    poller = AdaptivePoller(0.1, 1.0, 0.5, fast_window=0.0)
+    assert poller.next_interval(changed=False) == 1.0
+    assert poller.polls == 1 and poller.total_wait == 1.0
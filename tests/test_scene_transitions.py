@@ -0,0 +1,56 @@
+"""SceneTransitions 的预测集合与持久化。"""
+from Party.scene_transitions import MIN_OBSERVATIONS, PREDICT_TOP_K, SceneTransitions
+
+PRIORITY = ("a", "b", "c", "d", "e", "f", "g", "h")
+
+
+def _observe_pairs(model, prev, nexts):
+    for scene in nexts:
+        model.last_scene = prev
+        model.observe(scene)
+
+
+def test_no_prediction_without_history():
+    model = SceneTransitions()
+    assert model.candidates(PRIORITY) is None
+    _observe_pairs(model, "a", ["b"] * (MIN_OBSERVATIONS - 1))
+    model.last_scene = "a"
+    assert model.candidates(PRIORITY) is None
+
+
+def test_candidates_include_last_scene_and_always_in_priority_order():
+    model = SceneTransitions()
+    _observe_pairs(model, "c", ["e"] * MIN_OBSERVATIONS)
+    model.last_scene = "c"
+    assert model.candidates(PRIORITY, always=("h", "a")) == ("a", "c", "e", "h")
+
+
+def test_candidates_limited_to_top_k():
+    model = SceneTransitions()
+    nexts = ["b"] * 10 + ["c"] * 9 + ["d"] * 8 + ["e"] * 7 + ["f"] * 6 + ["g"] * 5
+    _observe_pairs(model, "a", nexts)
+    model.last_scene = "a"
+    picked = model.candidates(PRIORITY)
+    assert picked == ("a", "b", "c", "d", "e")
+    assert len(picked) == PREDICT_TOP_K + 1
+
+
+def test_self_loops_are_not_counted():
+    model = SceneTransitions()
+    for scene in ["a", "a", "a", "b", "b"]:
+        model.observe(scene)
+    model.observe(None)
+    assert model.transitions == {"a": {"b": 1}}
+    assert model.last_scene == "b"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "scene_transitions.json"
+    model = SceneTransitions(path)
+    _observe_pairs(model, "a", ["b"] * MIN_OBSERVATIONS)
+    assert model.save()
+    assert not model.save()  # 没有新观察时不重复写入
+    loaded = SceneTransitions.load(path)
+    assert loaded.transitions == {"a": {"b": MIN_OBSERVATIONS}}
+    path.write_text("{broken", encoding="utf-8")
+    assert SceneTransitions.load(path).transitions == {}
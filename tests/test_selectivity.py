@@ -0,0 +1,62 @@
+"""evaluate_groups 的提前退出与 HitRateTracker 的调度。"""
+from Utils.selectivity import HitRateTracker, evaluate_groups
+
+
+def _probe(counts, calls):
+    def probe(key):
+        calls.append(key)
+        return counts.get(key, 0)
+    return probe
+
+
+def test_first_satisfied_group_is_returned():
+    groups = [[(("a",), 2)], [(("b",), 1), (("c",), 1)]]
+    calls = []
+    idx, counts = evaluate_groups(groups, _probe({"a": 1, "b": 1, "c": 1}, calls))
+    assert idx == 1
+    assert counts == {"a": 1, "b": 1, "c": 1}
+
+
+def test_dead_group_skips_remaining_keys():
+    # a 不够时第一组放弃，b 也是 0 时第二组放弃，c / d 都不再匹配
+    groups = [[(("a",), 1), (("c",), 1)], [(("b",), 1), (("d",), 1)]]
+    calls = []
+    idx, _ = evaluate_groups(groups, _probe({}, calls))
+    assert idx is None
+    assert calls == ["a", "b"]
+
+
+def test_satisfied_first_group_stops_early():
+    groups = [[(("a",), 1)], [(("b",), 1)]]
+    calls = []
+    idx, _ = evaluate_groups(groups, _probe({"a": 1, "b": 1}, calls))
+    assert idx == 0
+    assert calls == ["a"]
+
+
+def test_alias_terms_sum_counts():
+    groups = [[(("str", "all"), 2)]]
+    idx, _ = evaluate_groups(groups, _probe({"str": 1, "all": 1}, []))
+    assert idx == 0
+
+
+def test_tracker_probes_rarest_first_and_counts_skips():
+    tracker = HitRateTracker()
+    for _ in range(5):
+        tracker.record("common", 1)
+        tracker.record("rare", 0)
+    groups = [[(("common",), 1), (("rare",), 1)]]
+    calls = []
+    idx, _ = evaluate_groups(groups, _probe({"common": 1}, calls), tracker, keys=["common", "rare", "other"])
+    assert idx is None
+    assert calls == ["rare"]
+    assert (tracker.last_probed, tracker.last_skipped) == (1, 2)
+
+
+def test_exhaust_if_empty_probes_until_a_hit():
+    groups = [[(("a",), 1)]]
+    calls = []
+    idx, counts = evaluate_groups(groups, _probe({"c": 1}, calls), keys=["a", "b", "c", "d"], exhaust_if_empty=True)
+    assert idx is None
+    assert calls == ["a", "b", "c"]
+    assert counts["c"] == 1